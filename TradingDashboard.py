@@ -1,9 +1,22 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
+
+from backtest import HORIZONS
+from charts import equity_chart_spec
+from data_loader import (CACHE_TTL, has_all_horizons, load_all_horizons, load_metrics_file, load_predictions, load_raw_metrics, local_version,
+                         predictions_version)
+from deep_dive import render_deep_dive
+from portfolio import MAX_POSITION_WEIGHT, MAX_POSITIONS, simulate
+from profiling import render_timing_panel, stage, start_run
+from ranking import OBJECTIVES, best_strategies, strategy_table
+from rendering import render_metrics_table
+from securities import DEEP_DIVES, SECURITIES, SECURITIES_BY_LABEL
+from sweep import DIRECTIONS, SIZING_RULES, sweep
+
+# Per-stage timings of this rerun, shown in the sidebar when profiling is enabled
+start_run()
 
 # Create a sidebar with navigation options
-page = st.sidebar.selectbox("Select a page:", ["Home", "Can Past Performance Guide Future Prediction?"])
+page = st.sidebar.selectbox("Select a page:", ["Home", "Can Past Performance Guide Future Prediction?", "Strategy Parameter Sweep", "Portfolio Simulation"])
 
 # Define content for each page
 if page == "Home":
@@ -24,217 +37,43 @@ if page == "Home":
     st.write('''We gather the results of the different strategies, and use this to define an optimal approach. It is important to emphasise, future performance does not neccesarily mean it will follow past performance, but it can be a good indication.''')
     st.write('''NB: The data used begins from 01/01/2022, and the end date is defined for each security.''')
     
-    optimal_strategies = []
-    
-    def get_optimal_strategy(data, security_name):
-        optimal_row = data.iloc[[6]] if security_name != 'VUKE (FTSE 100)' and security_name != 'VUKG (FTSE 100 Growth)' else data.iloc[[4]]
-        optimal_row['Security'] = security_name
-        return optimal_row
-    
-    def load_and_preprocess_data(csv_url):
-      data = pd.read_csv(csv_url)  
-      
-      # 1. Rename the first column and update its values
-      data.rename(columns={data.columns[0]: 'Days Holding'}, inplace=True)
-      data['Days Holding'] = range(1, 11)
-      
-      # 2. Remove the Average_RMSE column
-      data.drop(columns=['Average_RMSE'], inplace=True)
-      
-      # 3. Move the Average_MAE column to the end and rename it
-      average_mae = data.pop('Average_MAE')
-      data['Average MAE'] = average_mae
-      
-      # 4. Remove the specified columns
-      data.drop(columns=['Average_Actual_Return_Positive', 'Average_Actual_Return_Negative'], inplace=True)
-    
-      # 5. Rename a column and round its values to 3 decimal places, then add a % sign
-      data.rename(columns={'Average_Actual_Return_Positive_Daily': 'Daily Return with Positive Prediction Strategy'}, inplace=True)
-      data['Daily Return with Positive Prediction Strategy'] = data['Daily Return with Positive Prediction Strategy'].astype(float).round(3).astype(str) + '%'
-    
-      # 6. Do the equivalent for another column
-      data.rename(columns={'Average_Actual_Return_Negative_Daily': 'Daily Return with Negative Prediction Strategy'}, inplace=True)
-      data['Daily Return with Negative Prediction Strategy'] = data['Daily Return with Negative Prediction Strategy'].astype(float).round(3).astype(str) + '%'
-    
-      # 7. Rename two more columns
-      data.rename(columns={'Capital_Positive': 'Capital with Positive Prediction Strategy', 
-                           'Capital_Negative': 'Capital with Negative Prediction Strategy'}, inplace=True)
-      
-      # 8. Rename another column
-      data.rename(columns={'Capital_Daily_Investment': 'Capital Investing Every Day'}, inplace=True)
-      
-      # 9. Remove the Time_Taken column
-      data.drop(columns=['Time_Taken'], inplace=True)
-    
-      # 10. Round all numerical values to 3 decimal places
-      for col in data.select_dtypes(include=['float64']).columns:
-          data[col] = data[col].round(3)
-    
-    
-      return data
-    
-    csv_url_VUSA = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/VUSA_Metrics.csv'
-    csv_url_VUKE = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/VUKE_Metrics.csv'
-    csv_url_INRG = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/INRG_Metrics.csv'
-    csv_url_VUKG = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/VUKG_Metrics.csv'
-    csv_url_ARKK = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/ARKK_Metrics.csv'
-    csv_url_GLD = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/GLD_Metrics.csv'
-    csv_url_VNQ = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/VNQ_Metrics.csv'
-    csv_url_EEM = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/EEM_Metrics.csv'
-    csv_url_XLK = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/XLK_Metrics.csv'
-
-    
-    data_VUSA = load_and_preprocess_data(csv_url_VUSA)
-    data_VUKE = load_and_preprocess_data(csv_url_VUKE)
-    data_INRG = load_and_preprocess_data(csv_url_INRG)
-    data_VUKG = load_and_preprocess_data(csv_url_VUKG)
-    data_ARKK = load_and_preprocess_data(csv_url_ARKK)
-    data_GLD = load_and_preprocess_data(csv_url_GLD)
-    data_VNQ = load_and_preprocess_data(csv_url_VNQ)
-    data_EEM = load_and_preprocess_data(csv_url_EEM)
-    data_XLK = load_and_preprocess_data(csv_url_XLK)
-
-    
-    
-    styled_VUSA = data_VUSA.style.apply(lambda x: ['background: lightgreen' if x.name == 100 else '' for i in x], axis=1)\
-                 .set_properties(**{'width': '100px', 'text-align': 'center', 'font-size': '10pt'})\
-                 .set_table_styles([dict(selector='th', props=[('max-width', '80px'), 
-                                                               ('text-align', 'center'), 
-                                                               ('font-size', '10pt'), 
-                                                               ('height', '40px')])])
-    
-    styled_VUKE = data_VUKE.style.apply(lambda x: ['background: lightgreen' if x.name == 100 else '' for i in x], axis=1)\
-             .set_properties(**{'width': '100px', 'text-align': 'center', 'font-size': '10pt'})\
-             .set_table_styles([dict(selector='th', props=[('max-width', '80px'), 
-                                                           ('text-align', 'center'), 
-                                                           ('font-size', '10pt'), 
-                                                           ('height', '40px')])])
-    
-    styled_INRG = data_INRG.style.apply(lambda x: ['background: lightgreen' if x.name == 4 else '' for i in x], axis=1)\
-             .set_properties(**{'width': '100px', 'text-align': 'center', 'font-size': '10pt'})\
-             .set_table_styles([dict(selector='th', props=[('max-width', '80px'), 
-                                                           ('text-align', 'center'), 
-                                                           ('font-size', '10pt'), 
-                                                           ('height', '40px')])])
-    
-    styled_VUKG = data_VUKG.style.apply(lambda x: ['background: lightgreen' if x.name == 100 else '' for i in x], axis=1)\
-             .set_properties(**{'width': '100px', 'text-align': 'center', 'font-size': '10pt'})\
-             .set_table_styles([dict(selector='th', props=[('max-width', '80px'), 
-                                                           ('text-align', 'center'), 
-                                                           ('font-size', '10pt'), 
-                                                           ('height', '40px')])])
-    
-    styled_ARKK = data_ARKK.style.apply(lambda x: ['background: lightgreen' if x.name == 100 else '' for i in x], axis=1)\
-         .set_properties(**{'width': '100px', 'text-align': 'center', 'font-size': '10pt'})\
-         .set_table_styles([dict(selector='th', props=[('max-width', '80px'), 
-                                                       ('text-align', 'center'), 
-                                                       ('font-size', '10pt'), 
-                                                       ('height', '40px')])])
-
-    styled_GLD = data_GLD.style.apply(lambda x: ['background: lightgreen' if x.name == 2 else '' for i in x], axis=1)\
-         .set_properties(**{'width': '100px', 'text-align': 'center', 'font-size': '10pt'})\
-         .set_table_styles([dict(selector='th', props=[('max-width', '80px'), 
-                                                       ('text-align', 'center'), 
-                                                       ('font-size', '10pt'), 
-                                                       ('height', '40px')])])
-
-    styled_VNQ = data_VNQ.style.apply(lambda x: ['background: lightgreen' if x.name == 3 else '' for i in x], axis=1)\
-         .set_properties(**{'width': '100px', 'text-align': 'center', 'font-size': '10pt'})\
-         .set_table_styles([dict(selector='th', props=[('max-width', '80px'), 
-                                                       ('text-align', 'center'), 
-                                                       ('font-size', '10pt'), 
-                                                       ('height', '40px')])])
-
-    styled_EEM = data_EEM.style.apply(lambda x: ['background: lightgreen' if x.name == 100 else '' for i in x], axis=1)\
-         .set_properties(**{'width': '100px', 'text-align': 'center', 'font-size': '10pt'})\
-         .set_table_styles([dict(selector='th', props=[('max-width', '80px'), 
-                                                       ('text-align', 'center'), 
-                                                       ('font-size', '10pt'), 
-                                                       ('height', '40px')])])
-
-    styled_XLK = data_XLK.style.apply(lambda x: ['background: lightgreen' if x.name == 100 else '' for i in x], axis=1)\
-         .set_properties(**{'width': '100px', 'text-align': 'center', 'font-size': '10pt'})\
-         .set_table_styles([dict(selector='th', props=[('max-width', '80px'), 
-                                                       ('text-align', 'center'), 
-                                                       ('font-size', '10pt'), 
-                                                       ('height', '40px')])])
-    
-    
-    
-    
-    
-    selected_stock = st.selectbox('Select Security:', ['VUSA (S&P 500)', 'VUKE (FTSE 100)', 'INRG (iShares Global Clean Energy)', 'VUKG (FTSE 100 Growth)', 'ARKK (ARK Innovation)', 'GLD (Gold)', 'VNQ (US Real Estate)', 'EEM (Emerging Markets)', 'XLK (Technology Fund)'])
-    
-    if selected_stock == 'VUSA (S&P 500)':
-        st.markdown(styled_VUSA.to_html(), unsafe_allow_html=True)
-        st.markdown("")
-        st.markdown("<small>The algorithm performs very poorly. In no cases does the positive prediction strategy beat the investing every day strategy.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Interestingly, the predictive accuracy is actually so bad, that for horizons of 1, 2 and 3 days, investing when the model advises you to not invest, is better than the market rate. It is worth investigating this further, particularly for the 1 day horizon.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Last updated: 02/10/23.</small>", unsafe_allow_html=True)
-    
-    
-    elif selected_stock == 'VUKE (FTSE 100)':
-        st.markdown(styled_VUKE.to_html(), unsafe_allow_html=True)
-        st.markdown("")
-        st.markdown("<small>The algorithm performs poorly, with only 1 of the positive prediction investment strategies beating the respective market rate for that time horizon. This is holding for 3 days, but even so, the capital for investing every day is greater.</small>", unsafe_allow_html=True)
-        st.markdown("<small>In fact, the only times when the market rate is beaten is when we invest despite predicting negative returns, for horizons 7-10. This shows the algorithm as a poor predictor, but in fact investing when predictions are negative could be a viable strategy here. Further investigation is needed.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Last updated: 02/10/23.</small>", unsafe_allow_html=True)
-    
-    
-    elif selected_stock == 'INRG (iShares Global Clean Energy)':
-        st.markdown(styled_INRG.to_html(), unsafe_allow_html=True)
-        st.markdown("")
-        st.markdown("<small>The algorithm performs well. Investing when positive beats out investing every day in each of the horizons.</small>", unsafe_allow_html=True)
-        st.markdown("<small>The best investment strategy appears to be holding for 5 days, after the algorithm predicts positive predictions.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Last updated: 02/10/23.</small>", unsafe_allow_html=True)
-    
-    
-    elif selected_stock == 'VUKG (FTSE 100 Growth)':
-        st.markdown(styled_VUKG.to_html(), unsafe_allow_html=True)
-        st.markdown("")
-        st.markdown("<small>The algorithm performs poorly, with investing when positive being consistently beaten my the market rate.</small>", unsafe_allow_html=True)
-        st.markdown("<small>The strongest returns actually come when investing when the prediction of the algorithm is negative, over a 9 day horizon. Further investigation is needed.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Last updated: 02/10/23.</small>", unsafe_allow_html=True)
-
-    elif selected_stock == 'ARKK (ARK Innovation)':
-        st.markdown(styled_ARKK.to_html(), unsafe_allow_html=True)
-        st.markdown("")
-        st.markdown("<small>The algorithm performs poorly, with investing when positive being consistently beaten my the market rate.</small>", unsafe_allow_html=True)
-        st.markdown("<small>The strongest returns actually come when investing when the prediction of the algorithm is negative, over a 1 day horizon. Further investigation is needed.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Last updated: 11/10/23.</small>", unsafe_allow_html=True)
-
-    elif selected_stock == 'GLD (Gold)':
-        st.markdown(styled_GLD.to_html(), unsafe_allow_html=True)
-        st.markdown("")
-        st.markdown("<small>The algorithm performs adequately over certain time horizons, beating the market rate on a few occasions.</small>", unsafe_allow_html=True)
-        st.markdown("<small>The strongest returns come when investing when the prediction of the algorithm is positive, over a 3 day horizon.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Last updated: 11/10/23.</small>", unsafe_allow_html=True)
-
-    elif selected_stock == 'VNQ (US Real Estate)':
-        st.markdown(styled_VNQ.to_html(), unsafe_allow_html=True)
-        st.markdown("")
-        st.markdown("<small>The algorithm performs excellently, with investing when positive consistently beating the market rate, and usually by a significant margin.</small>", unsafe_allow_html=True)
-        st.markdown("<small>The strongest returns come when investing when the prediction of the algorithm is positive, over a 4 day horizon.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Last updated: 11/10/23.</small>", unsafe_allow_html=True)
-
-    elif selected_stock == 'EEM (Emerging Markets)':
-        st.markdown(styled_EEM.to_html(), unsafe_allow_html=True)
-        st.markdown("")
-        st.markdown("<small>The algorithm performs adequately, with investing when positive beating the market rate on occasion.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Despite this, returns are almost always negative for any of the strategies, so it seems best to ignore this ETF.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Last updated: 11/10/23.</small>", unsafe_allow_html=True)
-
-    elif selected_stock == 'XLK (Technology Fund)':
-        st.markdown(styled_XLK.to_html(), unsafe_allow_html=True)
-        st.markdown("")
-        st.markdown("<small>The algorithm performs poorly, with investing when positive being consistently beaten by the market rate.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Returns are generally high, but the algorithms almost never outperform investing every day. Since we want to focus on using the algorithm, it seems best to ignore this ETF.</small>", unsafe_allow_html=True)
-        st.markdown("<small>Last updated: 11/10/23.</small>", unsafe_allow_html=True)
+    selected_stock = st.selectbox('Select Security:', list(SECURITIES_BY_LABEL))
+    security = SECURITIES_BY_LABEL[selected_stock]
+    objective = st.selectbox('Rank strategies by:', list(OBJECTIVES))
+    
+    # Rank every (holding length, strategy) pair of every security, keeping the best one per security
+    @st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+    def rank_strategies(objective, metrics_files, versions):
+        # `versions` is only part of the cache key, so a rerun with unchanged Metrics files is a single lookup
+        raw_metrics = load_raw_metrics([filename for _, filename in metrics_files])
+        strategies = strategy_table({ticker: raw_metrics[filename] for ticker, filename in metrics_files})
+        return best_strategies(strategies, objective)
+    
+    with stage('Rank strategies'):
+        metrics_files = tuple((security.ticker, security.metrics_file) for security in SECURITIES)
+        leaderboard = rank_strategies(objective, metrics_files, tuple(local_version(filename) for _, filename in metrics_files))
+    best = leaderboard.set_index('Security').loc[security.ticker]
+    
+    # Only the selected security is loaded, and its rendered table is cached
+    data = load_metrics_file(security.metrics_file)
+    
+    # The highlighted row is the selected security's best holding length under the chosen objective
+    with stage('Render metrics table'):
+        st.markdown(render_metrics_table(data, int(best['Days Holding'])), unsafe_allow_html=True)
+    st.markdown("")
+    st.markdown(f"<small>Highlighted: the {best['Days Holding']}-Day Hold with the {best['Strategy']} strategy, the best for this security by {objective.lower()}.</small>", unsafe_allow_html=True)
+    for comment in security.commentary:
+        st.markdown(f"<small>{comment}</small>", unsafe_allow_html=True)
+    st.markdown(f"<small>Last updated: {security.last_updated}.</small>", unsafe_allow_html=True)
     
     
     st.markdown("")
     st.markdown("")
     
+    st.subheader('Optimal Strategy Leaderboard')
+    st.write('''For each security, we pick the holding length and strategy that scores best under the chosen objective. This is the row highlighted in each security's table above. Click a column header to sort the leaderboard.''')
+    st.dataframe(leaderboard, hide_index=True)
+    
     
 
 elif page == "Can Past Performance Guide Future Prediction?":
@@ -242,161 +81,68 @@ elif page == "Can Past Performance Guide Future Prediction?":
     
     st.write('''If we take the historical success as an indicator for future success with a trading strategy, it is important to evaluate if the past success was consistent. In this section, we evaluate the most successful cases in more detail.''')
 
-    with st.expander("INRG 5-Day Hold", expanded=True):
-    
-        st.subheader("INRG 5-Day Hold")
-        
-        # URL for the INRG dataset
-        csv_url_INRG = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/INRG_Predictions_Day5.csv'
-        
-        # Load the CSV data into a Pandas DataFrame
-        df = pd.read_csv(csv_url_INRG)
-        
-        # Convert 'Date' column to datetime type if it's not already
-        df['Date'] = pd.to_datetime(df['Date'])
-        
-        # Melt the DataFrame to long format for Altair plotting
-        df_melted = df.melt(id_vars='Date', value_vars=['Capital_Positive', 'Capital_Negative', 'Capital_Daily_Investment'])
-        
-        # Create Altair chart with custom color mapping
-        chart = alt.Chart(df_melted).mark_line().encode(
-            x=alt.X('Date:T', axis=alt.Axis(format="%b %Y")),  # Custom date format here
-            y=alt.Y('value:Q', scale=alt.Scale(zero=False)),
-            color=alt.Color('variable:N', scale=alt.Scale(domain=['Capital_Positive', 'Capital_Negative', 'Capital_Daily_Investment'],
-                                                          range=['green', 'red', 'gray']))
-        ).properties(
-            title="Capital Over Time"
-        )
-    
-        
-        st.altair_chart(chart, use_container_width=True)
-    
-        # Calculate the difference between 'Capital_Positive' and 'Capital_Daily_Investment'
-        df['Difference_Positive_DailyInvestment'] = df['Capital_Positive'] - df['Capital_Daily_Investment']
-        
-        # Create a new DataFrame for the Difference series
-        df_diff = df[['Date', 'Difference_Positive_DailyInvestment']].copy()
-        df_diff['Date'] = pd.to_datetime(df_diff['Date'])
-        
-        # Create Altair chart for the difference
-        chart_diff = alt.Chart(df_diff).mark_line().encode(
-            x=alt.X('Date:T', axis=alt.Axis(format="%b %Y")),
-            y=alt.Y('Difference_Positive_DailyInvestment:Q', scale=alt.Scale(zero=False))
-        ).properties(
-            title="Difference between Positive and Daily Investment Strategies"
-        )
-        
-        # Display the new Altair chart
-        st.altair_chart(chart_diff, use_container_width=True)
-    
-    
-        st.write('''We would ideally see a gradually increasingly slope in the graph showing the difference, but we can see that it is instead volatile. The positive investment strategy makes gains in April 2022 as it abstains from investing during a downturn, and the same happens in October 2022. However, between these periods the positive strategy fails to make gains as significant as investing every day. From October 2022 on, both strategies are similar.''')
-        st.write('''There is not a clear indication that the algorithm consistently overperforms the market rate.''')
-
-    with st.expander("GLD 5-Day Hold", expanded=True):
-    
-        st.subheader("GLD 5-Day Hold")
-        
-        # URL for the GLD dataset
-        csv_url_GLD = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/GLD_Predictions_Day3.csv'
-        
-        # Load the CSV data into a Pandas DataFrame
-        df = pd.read_csv(csv_url_GLD)
-        
-        # Convert 'Date' column to datetime type if it's not already
-        df['Date'] = pd.to_datetime(df['Date'])
-        
-        # Melt the DataFrame to long format for Altair plotting
-        df_melted = df.melt(id_vars='Date', value_vars=['Capital_Positive', 'Capital_Negative', 'Capital_Daily_Investment'])
-        
-        # Create Altair chart with custom color mapping
-        chart = alt.Chart(df_melted).mark_line().encode(
-            x=alt.X('Date:T', axis=alt.Axis(format="%b %Y")),  # Custom date format here
-            y=alt.Y('value:Q', scale=alt.Scale(zero=False)),
-            color=alt.Color('variable:N', scale=alt.Scale(domain=['Capital_Positive', 'Capital_Negative', 'Capital_Daily_Investment'],
-                                                          range=['green', 'red', 'gray']))
-        ).properties(
-            title="Capital Over Time"
-        )
-    
-        
-        st.altair_chart(chart, use_container_width=True)
-    
-        # Calculate the difference between 'Capital_Positive' and 'Capital_Daily_Investment'
-        df['Difference_Positive_DailyInvestment'] = df['Capital_Positive'] - df['Capital_Daily_Investment']
-        
-        # Create a new DataFrame for the Difference series
-        df_diff = df[['Date', 'Difference_Positive_DailyInvestment']].copy()
-        df_diff['Date'] = pd.to_datetime(df_diff['Date'])
-        
-        # Create Altair chart for the difference
-        chart_diff = alt.Chart(df_diff).mark_line().encode(
-            x=alt.X('Date:T', axis=alt.Axis(format="%b %Y")),
-            y=alt.Y('Difference_Positive_DailyInvestment:Q', scale=alt.Scale(zero=False))
-        ).properties(
-            title="Difference between Positive and Daily Investment Strategies"
-        )
-        
-        # Display the new Altair chart
-        st.altair_chart(chart_diff, use_container_width=True)
-    
-        st.write('''In general, the difference between the positive strategy and constant strategy is increasing. There is a major decline in the difference between September 2022 and November 2022, where a significant increase in the price of GLD is not anticipated by the algorithm.''')
-        st.write('''Nevertheless, the result is promising, and shows how usually, our algorithm ourperforms the market consistently.''')
-
-
-    with st.expander("VNQ 4-Day Hold", expanded=True):
-    
-        st.subheader("VNQ 4-Day Hold")
-        
-        # URL for the INRG dataset
-        csv_url_VNQ = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/VNQ_Predictions_Day4.csv'
-        
-        # Load the CSV data into a Pandas DataFrame
-        df = pd.read_csv(csv_url_VNQ)
-        
-        # Convert 'Date' column to datetime type if it's not already
-        df['Date'] = pd.to_datetime(df['Date'])
-        
-        # Melt the DataFrame to long format for Altair plotting
-        df_melted = df.melt(id_vars='Date', value_vars=['Capital_Positive', 'Capital_Negative', 'Capital_Daily_Investment'])
-        
-        # Create Altair chart with custom color mapping
-        chart = alt.Chart(df_melted).mark_line().encode(
-            x=alt.X('Date:T', axis=alt.Axis(format="%b %Y")),  # Custom date format here
-            y=alt.Y('value:Q', scale=alt.Scale(zero=False)),
-            color=alt.Color('variable:N', scale=alt.Scale(domain=['Capital_Positive', 'Capital_Negative', 'Capital_Daily_Investment'],
-                                                          range=['green', 'red', 'gray']))
-        ).properties(
-            title="Capital Over Time"
-        )
-    
-        
-        st.altair_chart(chart, use_container_width=True)
-    
-        # Calculate the difference between 'Capital_Positive' and 'Capital_Daily_Investment'
-        df['Difference_Positive_DailyInvestment'] = df['Capital_Positive'] - df['Capital_Daily_Investment']
-        
-        # Create a new DataFrame for the Difference series
-        df_diff = df[['Date', 'Difference_Positive_DailyInvestment']].copy()
-        df_diff['Date'] = pd.to_datetime(df_diff['Date'])
-        
-        # Create Altair chart for the difference
-        chart_diff = alt.Chart(df_diff).mark_line().encode(
-            x=alt.X('Date:T', axis=alt.Axis(format="%b %Y")),
-            y=alt.Y('Difference_Positive_DailyInvestment:Q', scale=alt.Scale(zero=False))
-        ).properties(
-            title="Difference between Positive and Daily Investment Strategies"
-        )
-        
-        # Display the new Altair chart
-        st.altair_chart(chart_diff, use_container_width=True)
-
-        st.write('''Our result here is strong, as the difference between our positive investment strategy and our constant investment strategy grows over time. It seems the main characteristic is the two are similar over period of time, before the alrogithm correctly predicts significant drops, which are avoided by the positive investment strategy.''')
-        st.write('''This is a promising result for our algorithm, as it performs well consistently in this case.
-        ''')
-
-    
-    
-    
-    
-    
+    # Each section only loads and charts its data while it is open
+    for deep_dive in DEEP_DIVES:
+        render_deep_dive(deep_dive)
+
+
+elif page == "Strategy Parameter Sweep":
+    st.title("Strategy Parameter Sweep")
+    
+    st.write('''The strategies on the Home page invest whenever the prediction is positive (or negative), with a fixed stake of (1/(Length of Holding Period))*100. Here we vary both choices at once. A strategy only invests when the size of the prediction is above a threshold, and the stake is either fixed, a proportion of the current capital, or scaled by the size of the prediction.''')
+    st.write('''Each table shows the final capital for every threshold and holding length, along with its excess over investing every day with the same stake sizing.''')
+    
+    @st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+    def sweep_results(ticker, versions):
+        return sweep(load_all_horizons(ticker))
+    
+    # Only securities with predictions for every holding length can be swept
+    available = [security for security in SECURITIES if has_all_horizons(security.ticker)]
+    selected_stock = st.selectbox('Select Security:', [security.label for security in available])
+    security = SECURITIES_BY_LABEL[selected_stock]
+    
+    direction = st.radio('Invest when the prediction is:', DIRECTIONS, horizontal=True)
+    sizing = st.radio('Stake sizing:', SIZING_RULES, horizontal=True)
+    
+    with stage('Parameter sweep'):
+        cube = sweep_results(security.ticker, tuple(predictions_version(security.ticker, days) for days in HORIZONS))
+    results = cube.loc[(sizing, direction)]
+    
+    st.markdown("<small>Final capital, by threshold (rows) and days holding (columns).</small>", unsafe_allow_html=True)
+    st.dataframe(results['Capital'].unstack('Days Holding').round(3))
+    st.markdown("<small>Excess over investing every day, by threshold (rows) and days holding (columns).</small>", unsafe_allow_html=True)
+    st.dataframe(results['Excess over Investing Every Day'].unstack('Days Holding').round(3))
+
+elif page == "Portfolio Simulation":
+    st.title("Portfolio Simulation")
+    
+    st.write('''The capital figures on the Home page treat each security and holding length on its own, with a fixed stake that can take capital below zero. Here we run one strategy across every chosen security and holding length at once, sharing a single pot of capital that starts at 100.''')
+    st.write('''Each day, positions that have reached the end of their holding period are closed and their proceeds returned. New positions are then opened, strongest predictions first, with a stake of (1/(Length of Holding Period)) of the current equity. No position may exceed the maximum weight, no more than the maximum number of positions may be open, and stakes are scaled down when there is not enough cash to fund them all.''')
+    
+    @st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+    def portfolio_results(keys, versions, direction, max_position_weight, max_positions):
+        series = {(ticker, days): load_predictions(ticker, days) for ticker, days in keys}
+        return simulate(series, direction, max_position_weight=max_position_weight, max_positions=max_positions)
+    
+    # Every security and holding length with predictions available locally
+    available = {security.label: [days for days in HORIZONS if predictions_version(security.ticker, days) is not None] for security in SECURITIES}
+    available = {label: horizons for label, horizons in available.items() if horizons}
+    selected_stocks = st.multiselect('Select Securities:', list(available), default=list(available))
+    selected_days = st.multiselect('Days Holding:', HORIZONS, default=HORIZONS)
+    direction = st.radio('Invest when the prediction is:', DIRECTIONS, horizontal=True)
+    max_position_weight = st.slider('Maximum weight of one position:', 0.05, 1.0, MAX_POSITION_WEIGHT, 0.05)
+    max_positions = st.slider('Maximum open positions:', 1, 100, MAX_POSITIONS)
+    
+    keys = tuple((SECURITIES_BY_LABEL[label].ticker, days) for label in selected_stocks for days in available[label] if days in selected_days)
+    if not keys:
+        st.write('''Select at least one security and holding length with predictions available.''')
+    else:
+        with stage('Portfolio simulation'):
+            curve, contributions = portfolio_results(keys, tuple(predictions_version(ticker, days) for ticker, days in keys),
+                                                     direction, max_position_weight, max_positions)
+        with stage('Portfolio charts'):
+            st.vega_lite_chart(equity_chart_spec(curve), width='stretch')
+        st.markdown(f"<small>Final equity: {curve['Equity'].iloc[-1]:.3f}, from {len(keys)} series over {len(curve)} dates.</small>", unsafe_allow_html=True)
+        st.dataframe(contributions.round(3), hide_index=True)
+
+render_timing_panel()
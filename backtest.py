@@ -0,0 +1,155 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+HORIZONS = list(range(1, 11))
+STARTING_CAPITAL = 100
+
+METRICS_COLUMNS = ['Method', 'Average_RMSE', 'Average_MAE', 'Average_Actual_Return_Positive', 'Average_Actual_Return_Negative',
+                   'Average_Actual_Return_Positive_Daily', 'Average_Actual_Return_Negative_Daily', 'Capital_Positive',
+                   'Capital_Negative', 'Capital_Daily_Investment', 'Time_Taken']
+CAPITAL_COLUMNS = ['Capital_Positive', 'Capital_Negative', 'Capital_Daily_Investment']
+
+# Formats used by the committed *_Predictions_DayN.csv files
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+FLOAT_FORMAT = '%.10g'
+
+
+def sheet_name(horizon):
+    return f'Predictions_{horizon}_Day_Return'
+
+
+def read_predictions_workbook(path):
+    """Read the Date/Actual/Predicted columns of every horizon sheet in a *_Predictions.xlsx workbook."""
+    sheets = pd.read_excel(path, sheet_name=None)
+    predictions = {}
+    for horizon in HORIZONS:
+        if sheet_name(horizon) in sheets:
+            predictions[horizon] = sheets[sheet_name(horizon)][['Date', 'Actual', 'Predicted']]
+    return predictions
+
+
+def read_predictions_sheet(path, horizon):
+    # Only the one horizon sheet is parsed, for work that needs a single holding length
+    return pd.read_excel(path, sheet_name=sheet_name(horizon), usecols=['Date', 'Actual', 'Predicted'])
+
+
+def stack_horizons(predictions):
+    # Pad every horizon to the longest series so all horizons fit in one (days, horizons) array
+    horizons = sorted(predictions)
+    length = max(len(predictions[horizon]) for horizon in horizons)
+    actual = np.full((length, len(horizons)), np.nan)
+    predicted = np.full((length, len(horizons)), np.nan)
+    for column, horizon in enumerate(horizons):
+        frame = predictions[horizon]
+        actual[:len(frame), column] = frame['Actual'].to_numpy(dtype=float)
+        predicted[:len(frame), column] = frame['Predicted'].to_numpy(dtype=float)
+    return horizons, actual, predicted
+
+
+def daily_return(average_return, horizons):
+    # Daily returns are the geometric per-day equivalent of the N day return
+    return ((1 + average_return / 100) ** (1 / horizons) - 1) * 100
+
+
+def capital_curves(actual, predicted, horizons):
+    """Capital curves for every horizon at once, investing 100/N per trade as described on the Home page."""
+    valid = ~np.isnan(actual)
+    positive = valid & (predicted > 0)
+    negative = valid & ~(predicted > 0)
+
+    stake = STARTING_CAPITAL / np.asarray(horizons, dtype=float)
+    profit = np.where(valid, stake * actual / 100, 0.0)
+
+    capital_positive = STARTING_CAPITAL + np.cumsum(np.where(positive, profit, 0.0), axis=0)
+    capital_negative = STARTING_CAPITAL + np.cumsum(np.where(negative, profit, 0.0), axis=0)
+    capital_daily = STARTING_CAPITAL + np.cumsum(profit, axis=0)
+    return capital_positive, capital_negative, capital_daily
+
+
+def compute_metrics(actual, predicted, horizons, curves=None):
+    """Every column of *_Metrics.csv, computed for all horizons in one pass over (days, horizons) arrays."""
+    horizons = np.asarray(horizons)
+    valid = ~np.isnan(actual)
+    positive = valid & (predicted > 0)
+    negative = valid & ~(predicted > 0)
+    actual_filled = np.where(valid, actual, 0.0)
+
+    # Each prediction is a single observation, so its RMSE equals its absolute error
+    absolute_error = np.abs(actual - predicted)
+    average_rmse = np.nanmean(np.sqrt(np.square(actual - predicted)), axis=0)
+    average_mae = np.nanmean(absolute_error, axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        average_positive = (actual_filled * positive).sum(axis=0) / positive.sum(axis=0)
+        average_negative = (actual_filled * negative).sum(axis=0) / negative.sum(axis=0)
+
+    if curves is None:
+        curves = capital_curves(actual, predicted, horizons)
+    capital_positive, capital_negative, capital_daily = curves
+    last = valid.sum(axis=0) - 1
+    columns = np.arange(len(horizons))
+
+    return pd.DataFrame({
+        'Method': [f'{horizon}_Day_Return' for horizon in horizons],
+        'Average_RMSE': average_rmse,
+        'Average_MAE': average_mae,
+        'Average_Actual_Return_Positive': average_positive,
+        'Average_Actual_Return_Negative': average_negative,
+        'Average_Actual_Return_Positive_Daily': daily_return(average_positive, horizons),
+        'Average_Actual_Return_Negative_Daily': daily_return(average_negative, horizons),
+        'Capital_Positive': capital_positive[last, columns],
+        'Capital_Negative': capital_negative[last, columns],
+        'Capital_Daily_Investment': capital_daily[last, columns],
+    })
+
+
+def run_backtest(predictions):
+    """Return the metrics frame and the per-horizon prediction frames with their capital curves."""
+    start = time.perf_counter()
+    horizons, actual, predicted = stack_horizons(predictions)
+    curves = capital_curves(actual, predicted, horizons)
+    metrics = compute_metrics(actual, predicted, horizons, curves)
+
+    series = {}
+    for column, horizon in enumerate(horizons):
+        frame = predictions[horizon][['Date', 'Actual', 'Predicted']].copy()
+        for name, curve in zip(CAPITAL_COLUMNS, curves):
+            frame[name] = curve[:len(frame), column]
+        series[horizon] = frame
+
+    metrics['Time_Taken'] = time.perf_counter() - start
+    return metrics[METRICS_COLUMNS], series
+
+
+def write_metrics(metrics, path):
+    metrics.to_csv(path, index=False, lineterminator='\r\n')
+
+
+def write_predictions(frame, path):
+    frame = frame.copy()
+    frame['Date'] = pd.to_datetime(frame['Date']).dt.strftime(DATE_FORMAT)
+    frame.to_csv(path, index=False, encoding='utf-8-sig', lineterminator='\r\n', float_format=FLOAT_FORMAT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate *_Metrics.csv and *_Predictions_DayN.csv from *_Predictions.xlsx workbooks.')
+    parser.add_argument('workbooks', nargs='+', help='Paths to <TICKER>_Predictions.xlsx workbooks')
+    parser.add_argument('--output-dir', default='.', help='Directory to write the CSV files to')
+    parser.add_argument('--days', type=int, nargs='*', default=[], help='Holding lengths to export as <TICKER>_Predictions_DayN.csv')
+    args = parser.parse_args()
+
+    for workbook in args.workbooks:
+        ticker = os.path.basename(workbook).split('_')[0]
+        metrics, series = run_backtest(read_predictions_workbook(workbook))
+        write_metrics(metrics, os.path.join(args.output_dir, f'{ticker}_Metrics.csv'))
+        for horizon in args.days:
+            write_predictions(series[horizon], os.path.join(args.output_dir, f'{ticker}_Predictions_Day{horizon}.csv'))
+        print(f'{ticker}: {len(series)} horizons in {metrics["Time_Taken"].iloc[0]:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
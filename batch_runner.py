@@ -0,0 +1,102 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from backtest import HORIZONS, METRICS_COLUMNS, compute_metrics, read_predictions_sheet, stack_horizons, write_metrics
+from data_source import record_local_write
+from fileio import atomic_write
+
+# Finished work units are stored here, one JSON file per (security, horizon)
+UNITS_DIR = '.units'
+
+
+def unit_path(output_dir, ticker, horizon):
+    return os.path.join(output_dir, UNITS_DIR, f'{ticker}_{horizon}.json')
+
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def unit_is_current(output_dir, ticker, horizon, workbook_sha256):
+    # A finished unit is only reused if it was evaluated from the workbook as it is now
+    path = unit_path(output_dir, ticker, horizon)
+    if not os.path.exists(path):
+        return False
+    with open(path) as f:
+        return json.load(f).get('workbook_sha256') == workbook_sha256
+
+
+def evaluate_unit(workbook, workbook_sha256, ticker, horizon, output_dir):
+    """Evaluate one (security, horizon) pair and store its metrics row, tagged with the workbook it came from."""
+    predictions = read_predictions_sheet(workbook, horizon)
+
+    # Time_Taken covers the evaluation only, not reading the sheet
+    start = time.perf_counter()
+    horizons, actual, predicted = stack_horizons({horizon: predictions})
+    row = compute_metrics(actual, predicted, horizons).iloc[0].to_dict()
+    row['Time_Taken'] = time.perf_counter() - start
+
+    def write(path):
+        with open(path, 'w') as f:
+            json.dump({'workbook_sha256': workbook_sha256, 'metrics': row}, f)
+
+    atomic_write(unit_path(output_dir, ticker, horizon), write)
+    return ticker, horizon, row['Time_Taken']
+
+
+def assemble_metrics(output_dir, ticker):
+    # Combine the finished units of a security into <TICKER>_Metrics.csv
+    rows = []
+    for horizon in HORIZONS:
+        with open(unit_path(output_dir, ticker, horizon)) as f:
+            rows.append(json.load(f)['metrics'])
+    metrics = pd.DataFrame(rows)[METRICS_COLUMNS]
+    path = os.path.join(output_dir, f'{ticker}_Metrics.csv')
+    atomic_write(path, lambda temp_path: write_metrics(metrics, temp_path))
+    record_local_write(path)
+
+
+def run_batch(workbooks, output_dir, workers=None):
+    """Evaluate every (security, horizon) unit across a process pool, skipping units already finished from the same workbook."""
+    os.makedirs(os.path.join(output_dir, UNITS_DIR), exist_ok=True)
+    tickers = {os.path.basename(workbook).split('_')[0]: workbook for workbook in workbooks}
+    digests = {ticker: file_sha256(workbook) for ticker, workbook in tickers.items()}
+
+    pending = [(workbook, digests[ticker], ticker, horizon) for ticker, workbook in tickers.items() for horizon in HORIZONS
+               if not unit_is_current(output_dir, ticker, horizon, digests[ticker])]
+    print(f'{len(pending)} of {len(tickers) * len(HORIZONS)} units to evaluate')
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(evaluate_unit, *unit, output_dir) for unit in pending]
+        for future in as_completed(futures):
+            ticker, horizon, time_taken = future.result()
+            print(f'{ticker} {horizon}_Day_Return: {time_taken:.3f}s')
+
+    for ticker in tickers:
+        assemble_metrics(output_dir, ticker)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate every security and holding length in parallel, writing <TICKER>_Metrics.csv files.')
+    parser.add_argument('--input-dir', default='.', help='Directory containing <TICKER>_Predictions.xlsx workbooks')
+    parser.add_argument('--output-dir', default='.', help='Directory to write the Metrics files to')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (defaults to the CPU count)')
+    parser.add_argument('tickers', nargs='*', help='Only evaluate these tickers')
+    args = parser.parse_args()
+
+    workbooks = sorted(glob.glob(os.path.join(args.input_dir, '*_Predictions.xlsx')))
+    if args.tickers:
+        workbooks = [workbook for workbook in workbooks if os.path.basename(workbook).split('_')[0] in args.tickers]
+    run_batch(workbooks, args.output_dir, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""Headless benchmark of dashboard reruns against generated fixture data.
+
+Runs every page of TradingDashboard.py through Streamlit's AppTest with 10, 100 and 1000 synthetic securities (by default)
+and reports cold and warm rerun times, per-stage timings and peak Python memory. The fixtures live in a temporary
+directory that is removed when the benchmark exits.
+
+Usage: python benchmarks/bench_dashboard.py --securities 10 100 1000 --years 2 10
+"""
+import argparse
+import itertools
+import os
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = tempfile.TemporaryDirectory(prefix='tradingstrategies-bench-')
+FIXTURE_DIR = FIXTURES.name
+
+# Must be set before the dashboard modules are imported, as they read it at import time
+os.environ['TRADINGSTRATEGIES_DATA_DIR'] = FIXTURE_DIR
+# Stage timings are only recorded while profiling is enabled
+os.environ['TRADINGSTRATEGIES_PROFILE'] = '1'
+sys.path.insert(0, REPO_DIR)
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import data_loader
+import securities
+from backtest import HORIZONS, run_backtest, write_metrics, write_predictions
+from profiling import TIMINGS_KEY
+from securities import DeepDive, Security
+
+PAGES = ['Home', 'Can Past Performance Guide Future Prediction?', 'Strategy Parameter Sweep', 'Portfolio Simulation']
+TRADING_DAYS_PER_YEAR = 252
+
+# Deep-dive sections that start expanded, as on the real page
+EXPANDED_DEEP_DIVES = 3
+
+# Securities with a DayN file for every holding length, like those with a workbook, so the sweep page has data
+FULL_HISTORY_SECURITIES = 3
+
+
+def fixture_tickers(count):
+    # Letter-only tickers, matching the <TICKER>_Predictions_DayN naming the storage layer expects
+    letters = itertools.product(string.ascii_uppercase, repeat=4)
+    return [''.join(next(letters)) for _ in range(count)]
+
+
+def write_fixtures(count, years, seed=0):
+    """Write Metrics and one Predictions_DayN file per synthetic security, and point the registries at them."""
+    for filename in os.listdir(FIXTURE_DIR):
+        os.remove(os.path.join(FIXTURE_DIR, filename))
+
+    rng = np.random.default_rng(seed)
+    length = years * TRADING_DAYS_PER_YEAR
+    dates = pd.bdate_range('2022-01-03', periods=length + max(HORIZONS))
+    tickers = fixture_tickers(count)
+
+    for position, ticker in enumerate(tickers):
+        predictions = {}
+        for horizon in HORIZONS:
+            actual = rng.normal(0.05 * horizon, 1.5 * np.sqrt(horizon), length)
+            predicted = 0.3 * actual + rng.normal(0, 1.5 * np.sqrt(horizon), length)
+            predictions[horizon] = pd.DataFrame({'Date': dates[horizon:horizon + length], 'Actual': actual, 'Predicted': predicted})
+        metrics, series = run_backtest(predictions)
+        write_metrics(metrics, os.path.join(FIXTURE_DIR, f'{ticker}_Metrics.csv'))
+        written = HORIZONS if position < FULL_HISTORY_SECURITIES else [HORIZONS[position % len(HORIZONS)]]
+        for days in written:
+            write_predictions(series[days], os.path.join(FIXTURE_DIR, f'{ticker}_Predictions_Day{days}.csv'))
+
+    # The registries are module-level lists, so they are updated in place for the dashboard to pick up
+    securities.SECURITIES[:] = [Security(ticker=ticker, name=f'Fixture {position}', metrics_file=f'{ticker}_Metrics.csv',
+                                         commentary=('Fixture data.',),
+                                         last_updated='01/01/24')
+                                for position, ticker in enumerate(tickers)]
+    securities.SECURITIES_BY_LABEL.clear()
+    securities.SECURITIES_BY_LABEL.update({security.label: security for security in securities.SECURITIES})
+    securities.DEEP_DIVES[:] = [DeepDive(ticker=ticker, days=HORIZONS[position % len(HORIZONS)], expanded=position < EXPANDED_DEEP_DIVES)
+                                for position, ticker in enumerate(tickers)]
+    data_loader.METRICS_FILES[:] = [security.metrics_file for security in securities.SECURITIES]
+
+
+def open_page(page):
+    app = AppTest.from_file(os.path.join(REPO_DIR, 'TradingDashboard.py'), default_timeout=600)
+    app.run()
+    if page != PAGES[0]:
+        app.sidebar.selectbox[0].select(page)
+    return app
+
+
+def timed_run(app):
+    start = time.perf_counter()
+    app.run()
+    elapsed = time.perf_counter() - start
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return elapsed, list(app.session_state[TIMINGS_KEY])
+
+
+def benchmark_page(page):
+    """Cold and warm rerun times, stage timings of the cold rerun, and peak memory of a cold rerun."""
+    app = open_page(page)
+    st.cache_data.clear()
+    cold, stages = timed_run(app)
+    warm, _ = timed_run(app)
+
+    st.cache_data.clear()
+    tracemalloc.start()
+    timed_run(app)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cold, warm, peak / 2 ** 20, stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dashboard reruns against generated fixture data.')
+    parser.add_argument('--securities', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--years', type=int, nargs='+', default=[2, 10])
+    parser.add_argument('--stages', type=int, default=5, help='Number of slowest stages to show per run')
+    parser.add_argument('--output', help='Also write every stage timing to this CSV')
+    args = parser.parse_args()
+
+    summary = []
+    stage_rows = []
+    try:
+        for count in args.securities:
+            for years in args.years:
+                write_fixtures(count, years)
+                for page in PAGES:
+                    cold, warm, peak, stages = benchmark_page(page)
+                    summary.append({'Securities': count, 'Years': years, 'Page': page, 'Cold (s)': cold, 'Warm (s)': warm,
+                                    'Peak Memory (MB)': peak})
+                    stage_rows += [{'Securities': count, 'Years': years, 'Page': page, 'Stage': name, 'Seconds': seconds}
+                                   for name, seconds in stages]
+                    print(f'{count} securities, {years} years, {page}: cold {cold:.3f}s, warm {warm:.3f}s, peak {peak:.1f}MB')
+                    for name, seconds in sorted(stages, key=lambda item: -item[1])[:args.stages]:
+                        print(f'    {name}: {seconds:.4f}s')
+    finally:
+        FIXTURES.cleanup()
+
+    print()
+    print(pd.DataFrame(summary).round(3).to_string(index=False))
+    if args.output:
+        pd.DataFrame(stage_rows).to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from rendering import frame_digest
+
+# Approximate width of a chart in the main column; more points than pixels cannot be seen
+CHART_WIDTH_PX = 800
+
+CAPITAL_COLUMNS = ['Capital_Positive', 'Capital_Negative', 'Capital_Daily_Investment']
+CAPITAL_COLOURS = ['green', 'red', 'gray']
+
+EQUITY_COLUMNS = ['Equity', 'Invested']
+EQUITY_COLOURS = ['steelblue', 'orange']
+
+
+def lttb(x, y, threshold):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling."""
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+
+    # The first and last points are always kept, the rest are split into equal buckets
+    edges = np.linspace(1, length - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = length - 1
+
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Average of the next bucket, or the last point for the final bucket
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else length
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        previous = selected[bucket]
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        selected[bucket + 1] = start + np.argmax(areas)
+    return selected
+
+
+def downsample(data, columns, max_points=CHART_WIDTH_PX):
+    # Downsample each series on its own and return them in the long format Altair expects
+    x = data['Date'].to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+    frames = []
+    for column in columns:
+        y = data[column].to_numpy(dtype=float)
+        kept = lttb(x, y, max_points)
+        frames.append(pd.DataFrame({'Date': data['Date'].to_numpy()[kept], 'variable': column, 'value': y[kept]}))
+    return pd.concat(frames, ignore_index=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=500)
+def _capital_chart_spec(digest, max_points, _data):
+    chart = alt.Chart(downsample(_data, CAPITAL_COLUMNS, max_points)).mark_line().encode(
+        x=alt.X('Date:T', axis=alt.Axis(format="%b %Y")),
+        y=alt.Y('value:Q', scale=alt.Scale(zero=False)),
+        color=alt.Color('variable:N', scale=alt.Scale(domain=CAPITAL_COLUMNS, range=CAPITAL_COLOURS))
+    ).properties(
+        title="Capital Over Time"
+    )
+    return chart.to_dict()
+
+
+@st.cache_data(show_spinner=False, max_entries=500)
+def _difference_chart_spec(digest, column, max_points, _data):
+    data = downsample(_data, [column], max_points).drop(columns='variable').rename(columns={'value': column})
+    chart = alt.Chart(data).mark_line().encode(
+        x=alt.X('Date:T', axis=alt.Axis(format="%b %Y")),
+        y=alt.Y(f'{column}:Q', scale=alt.Scale(zero=False))
+    ).properties(
+        title="Difference between Positive and Daily Investment Strategies"
+    )
+    return chart.to_dict()
+
+
+@st.cache_data(show_spinner=False, max_entries=500)
+def _equity_chart_spec(digest, max_points, _data):
+    chart = alt.Chart(downsample(_data, EQUITY_COLUMNS, max_points)).mark_line().encode(
+        x=alt.X('Date:T', axis=alt.Axis(format="%b %Y")),
+        y=alt.Y('value:Q', scale=alt.Scale(zero=False)),
+        color=alt.Color('variable:N', scale=alt.Scale(domain=EQUITY_COLUMNS, range=EQUITY_COLOURS))
+    ).properties(
+        title="Portfolio Equity Over Time"
+    )
+    return chart.to_dict()
+
+
+def capital_chart_spec(data, max_points=CHART_WIDTH_PX):
+    """Vega-Lite spec of the three capital curves, downsampled and cached per dataset."""
+    return _capital_chart_spec(frame_digest(data[['Date'] + CAPITAL_COLUMNS]), max_points, data)
+
+
+def difference_chart_spec(data, column='Difference_Positive_DailyInvestment', max_points=CHART_WIDTH_PX):
+    """Vega-Lite spec of a single difference series, downsampled and cached per dataset."""
+    return _difference_chart_spec(frame_digest(data[['Date', column]]), column, max_points, data)
+
+
+def equity_chart_spec(data, max_points=CHART_WIDTH_PX):
+    """Vega-Lite spec of a portfolio's equity and invested capital, downsampled and cached per simulation."""
+    return _equity_chart_spec(frame_digest(data[['Date'] + EQUITY_COLUMNS]), max_points, data)
@@ -0,0 +1,167 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+from backtest import HORIZONS
+from data_source import is_recorded, read_bytes, resolve
+from profiling import stage
+from securities import SECURITIES
+from storage import LOCAL_DIR, parse_csv, read_frame, source_path
+
+# How long fetched files are trusted before being checked again, in seconds
+CACHE_TTL = 60 * 60
+
+# Number of files fetched at the same time
+MAX_WORKERS = 16
+
+METRICS_FILES = [security.metrics_file for security in SECURITIES]
+
+
+def local_version(filename):
+    # The modification time of the local snapshot copy, or None if the file has to come from GitHub
+    local_path = os.path.join(LOCAL_DIR, filename)
+    if os.path.exists(local_path):
+        return os.path.getmtime(local_path)
+    return None
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def fetch_files(filenames, versions):
+    # `versions` is only part of the cache key, so editing a local file invalidates the cached bytes
+    # Each file is read from the local snapshot, and only fetched when the snapshot copy is missing or stale
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(filenames))) as executor:
+        contents = list(executor.map(read_bytes, filenames))
+    return dict(zip(filenames, contents))
+
+
+def preprocess_metrics(data):
+    # 1. Rename the first column and update its values
+    data.rename(columns={data.columns[0]: 'Days Holding'}, inplace=True)
+    data['Days Holding'] = range(1, 11)
+
+    # 2. Remove the Average_RMSE column
+    data.drop(columns=['Average_RMSE'], inplace=True)
+
+    # 3. Move the Average_MAE column to the end and rename it
+    average_mae = data.pop('Average_MAE')
+    data['Average MAE'] = average_mae
+
+    # 4. Remove the specified columns
+    data.drop(columns=['Average_Actual_Return_Positive', 'Average_Actual_Return_Negative'], inplace=True)
+
+    # 5. Rename a column and round its values to 3 decimal places, then add a % sign
+    data.rename(columns={'Average_Actual_Return_Positive_Daily': 'Daily Return with Positive Prediction Strategy'}, inplace=True)
+    data['Daily Return with Positive Prediction Strategy'] = data['Daily Return with Positive Prediction Strategy'].astype(float).round(3).astype(str) + '%'
+
+    # 6. Do the equivalent for another column
+    data.rename(columns={'Average_Actual_Return_Negative_Daily': 'Daily Return with Negative Prediction Strategy'}, inplace=True)
+    data['Daily Return with Negative Prediction Strategy'] = data['Daily Return with Negative Prediction Strategy'].astype(float).round(3).astype(str) + '%'
+
+    # 7. Rename two more columns
+    data.rename(columns={'Capital_Positive': 'Capital with Positive Prediction Strategy',
+                         'Capital_Negative': 'Capital with Negative Prediction Strategy'}, inplace=True)
+
+    # 8. Rename another column
+    data.rename(columns={'Capital_Daily_Investment': 'Capital Investing Every Day'}, inplace=True)
+
+    # 9. Remove the Time_Taken column
+    data.drop(columns=['Time_Taken'], inplace=True)
+
+    # 10. Round all numerical values to 3 decimal places
+    for col in data.select_dtypes(include=['float64']).columns:
+        data[col] = data[col].round(3)
+
+    return data
+
+
+# Bounded, as every new version of a file adds an entry; 1000 entries still hold the current version of every Metrics file
+@st.cache_data(show_spinner=False, max_entries=1000)
+def parse_content(digest, _content):
+    # Keyed on the content hash only, so unchanged files are never parsed twice
+    return pd.read_csv(BytesIO(_content))
+
+
+@st.cache_data(show_spinner=False, max_entries=1000)
+def preprocess_content(digest, _content):
+    return preprocess_metrics(parse_content(digest, _content))
+
+
+def load_contents(filenames, parse):
+    filenames = tuple(filenames)
+    with stage('Fetch Metrics CSVs'):
+        versions = tuple(local_version(filename) for filename in filenames)
+        contents = fetch_files(filenames, versions)
+
+    frames = {}
+    with stage('Parse Metrics CSVs'):
+        for filename in filenames:
+            content = contents[filename]
+            frames[filename] = parse(hashlib.sha256(content).hexdigest(), content)
+    return frames
+
+
+def load_metrics(filenames=METRICS_FILES):
+    """Load and preprocess every Metrics CSV, returning a dict keyed by filename."""
+    return load_contents(filenames, preprocess_content)
+
+
+def load_raw_metrics(filenames=METRICS_FILES):
+    """Load every Metrics CSV with its original columns and unrounded values, keyed by filename."""
+    return load_contents(filenames, parse_content)
+
+
+def load_metrics_file(filename):
+    """Load and preprocess a single Metrics CSV."""
+    return load_metrics([filename])[filename]
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _load_predictions(name, version):
+    # `version` is the local file and its mtime, or None when only GitHub has the data
+    if version is not None:
+        return read_frame(name, directory=LOCAL_DIR)
+    return parse_csv(BytesIO(read_bytes(f'{name}.csv')))
+
+
+def check_predictions_source(ticker, days):
+    # Check the CSV or workbook a series comes from against the data manifest, as read_bytes does for Metrics files
+    for filename in [f'{ticker}_Predictions_Day{days}.csv', f'{ticker}_Predictions.xlsx']:
+        if os.path.exists(os.path.join(LOCAL_DIR, filename)) or is_recorded(filename, LOCAL_DIR):
+            try:
+                resolve(filename, LOCAL_DIR)
+            except OSError:
+                # Missing and could not be fetched, so the series is reported as unavailable
+                pass
+            return
+
+
+def predictions_version(ticker, days):
+    # The local file a series is read from and its mtime, used as part of cache keys
+    check_predictions_source(ticker, days)
+    path = source_path(f'{ticker}_Predictions_Day{days}', LOCAL_DIR)
+    return None if path is None else (path, os.path.getmtime(path))
+
+
+def load_predictions(ticker, days):
+    """Load a <TICKER>_Predictions_Day<N> series with a typed Date column, from Parquet when available."""
+    return _load_predictions(f'{ticker}_Predictions_Day{days}', predictions_version(ticker, days))
+
+
+def has_all_horizons(ticker):
+    # True when every holding length of a security can be read locally, e.g. from its *_Predictions.xlsx workbook
+    return all(predictions_version(ticker, days) is not None for days in HORIZONS)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _load_all_horizons(ticker, versions):
+    return {days: read_frame(f'{ticker}_Predictions_Day{days}', columns=['Date', 'Actual', 'Predicted'], directory=LOCAL_DIR)
+            for days in HORIZONS}
+
+
+def load_all_horizons(ticker):
+    """Load the Date/Actual/Predicted series of every holding length of a security, keyed by days."""
+    return _load_all_horizons(ticker, tuple(predictions_version(ticker, days) for days in HORIZONS))
@@ -0,0 +1,269 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+import warnings
+from email.utils import formatdate
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from fileio import atomic_write
+from storage import LOCAL_DIR
+
+# Remote location of the datasets, only used when the local snapshot is missing, damaged or expired
+BASE_URL = 'https://raw.githubusercontent.com/NathanLever7/TradingStrategies/main/'
+
+# Checksums, sizes and row counts of the snapshot, kept next to the datasets
+MANIFEST_FILE = 'data_manifest.json'
+
+# Files recorded in the manifest
+DATASET_PATTERNS = ['*_Metrics.csv', '*_Predictions_Day*.csv', '*_Predictions.xlsx']
+
+# Seconds after which an unmodified snapshot file is checked against GitHub; unset means never
+MAX_AGE_ENV = 'TRADINGSTRATEGIES_SNAPSHOT_MAX_AGE'
+# Set to never contact GitHub, even for missing files
+OFFLINE_ENV = 'TRADINGSTRATEGIES_OFFLINE'
+
+REQUEST_TIMEOUT = 30
+
+_manifest_lock = threading.Lock()
+# sha256 of local files keyed by (path, size, mtime), so unchanged files are hashed once per process
+_digests = {}
+# Parsed manifests keyed by path, with the (mtime, size, inode) they were read at
+_manifests = {}
+
+
+def manifest_path(directory=LOCAL_DIR):
+    return os.path.join(directory, MANIFEST_FILE)
+
+
+def load_manifest(directory=LOCAL_DIR):
+    """The manifest of `directory`, parsed again only when the file changes; callers must copy it before editing."""
+    path = manifest_path(directory)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    version = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    cached = _manifests.get(path)
+    if cached is None or cached[0] != version:
+        with open(path) as f:
+            cached = (version, json.load(f))
+        _manifests[path] = cached
+    return cached[1]
+
+
+def save_manifest(manifest, directory=LOCAL_DIR):
+    def write(temp_path):
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write('\n')
+    atomic_write(manifest_path(directory), write)
+
+
+def count_rows(filename, content):
+    # Data rows of a CSV, used to tell a truncated file from one that has been extended; None for workbooks
+    if not filename.endswith('.csv'):
+        return None
+    return max(content.count(b'\n') - 1 + (not content.endswith(b'\n')), 0)
+
+
+def describe(filename, content):
+    return {'sha256': hashlib.sha256(content).hexdigest(), 'size': len(content), 'rows': count_rows(filename, content)}
+
+
+def file_digest(path):
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if key not in _digests:
+        with open(path, 'rb') as f:
+            _digests[key] = hashlib.sha256(f.read()).hexdigest()
+    return _digests[key]
+
+
+def snapshot_status(filename, entry, directory=LOCAL_DIR):
+    """'missing', 'unrecorded', 'ok', 'modified' (checksum differs, rows kept) or 'damaged' (checksum differs, rows lost)."""
+    path = os.path.join(directory, filename)
+    if not os.path.exists(path):
+        return 'missing'
+    if entry is None:
+        return 'unrecorded'
+    if os.path.getsize(path) == entry['size'] and file_digest(path) == entry['sha256']:
+        return 'ok'
+    if entry['rows'] is not None:
+        with open(path, 'rb') as f:
+            if count_rows(filename, f.read()) < entry['rows']:
+                return 'damaged'
+    return 'modified'
+
+
+def expired(entry):
+    max_age = os.environ.get(MAX_AGE_ENV)
+    return bool(max_age) and time.time() - entry.get('checked', 0) > float(max_age)
+
+
+def conditional_fetch(filename, entry=None):
+    """GET a file from GitHub, returning (content, headers), or (None, headers) when it has not changed since `entry`."""
+    headers = {}
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    try:
+        with urlopen(Request(BASE_URL + filename, headers=headers), timeout=REQUEST_TIMEOUT) as response:
+            return response.read(), response.headers
+    except HTTPError as error:
+        if error.code == 304:
+            return None, error.headers
+        raise
+
+
+def refresh(filename, entry, directory=LOCAL_DIR):
+    """Fetch a file that is missing, damaged or expired, store it in the snapshot and record it in the manifest."""
+    path = os.path.join(directory, filename)
+    # A conditional request is only safe when the local copy is the one the manifest describes
+    status = snapshot_status(filename, entry, directory)
+    content, headers = conditional_fetch(filename, entry if status == 'ok' else None)
+    changed = content is not None
+
+    if not changed:
+        with open(path, 'rb') as f:
+            content = f.read()
+        record = dict(entry)
+    else:
+        record = describe(filename, content)
+        if entry is not None and entry['rows'] is not None and record['rows'] < entry['rows']:
+            raise ValueError(f'{filename} from GitHub has {record["rows"]} rows, fewer than the {entry["rows"]} in the snapshot')
+
+        def write(temp_path):
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+        atomic_write(path, write)
+
+    record['etag'] = headers.get('ETag') or record.get('etag')
+    record['last_modified'] = headers.get('Last-Modified') or record.get('last_modified')
+    record['checked'] = time.time()
+    if changed:
+        record['fetched'] = formatdate(record['checked'], usegmt=True)
+    with _manifest_lock:
+        manifest = dict(load_manifest(directory))
+        manifest[filename] = record
+        save_manifest(manifest, directory)
+    return content
+
+
+def record_local_write(path):
+    """Re-record a dataset just rewritten by a local tool, if its directory has a manifest.
+
+    The entry is marked as local, so an expired snapshot never replaces it with GitHub's copy.
+    """
+    directory, filename = os.path.split(os.path.abspath(path))
+    with _manifest_lock:
+        manifest = load_manifest(directory)
+        if not manifest:
+            return
+        with open(path, 'rb') as f:
+            record = describe(filename, f.read())
+        record['local'] = True
+        manifest = dict(manifest)
+        manifest[filename] = record
+        save_manifest(manifest, directory)
+
+
+def is_recorded(filename, directory=LOCAL_DIR):
+    return filename in load_manifest(directory)
+
+
+def resolve(filename, directory=LOCAL_DIR):
+    """Path of a dataset in the local snapshot, fetched from GitHub first when the local copy is missing, damaged or expired."""
+    entry = load_manifest(directory).get(filename)
+    status = snapshot_status(filename, entry, directory)
+    path = os.path.join(directory, filename)
+
+    # A checksum mismatch that keeps every row is either corruption or a locally regenerated file, so it is served with a
+    # warning until `python data_source.py build` records the new contents
+    if status == 'modified':
+        warnings.warn(f'{filename} does not match its checksum in {MANIFEST_FILE}; '
+                      f'if it was regenerated locally, run `python data_source.py build` to record it')
+
+    stale = status in ('missing', 'damaged') or (status == 'ok' and not entry.get('local') and expired(entry))
+    if stale and not os.environ.get(OFFLINE_ENV):
+        try:
+            refresh(filename, entry, directory)
+        except (URLError, OSError, ValueError) as error:
+            if status == 'missing':
+                raise
+            warnings.warn(f'Could not refresh {filename} ({error}), using the local snapshot')
+    elif status == 'missing':
+        raise FileNotFoundError(f'{filename} is not in the local snapshot and {OFFLINE_ENV} is set')
+    return path
+
+
+def read_bytes(filename, directory=LOCAL_DIR):
+    """Read a dataset from the local snapshot, going to GitHub only when the snapshot copy is missing, damaged or expired."""
+    with open(resolve(filename, directory), 'rb') as f:
+        return f.read()
+
+
+def build_manifest(directory=LOCAL_DIR):
+    """Record every dataset in `directory`, keeping the ETag and Last-Modified of files that have not changed."""
+    previous = load_manifest(directory)
+    manifest = {}
+    for pattern in DATASET_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(directory, pattern))):
+            filename = os.path.basename(path)
+            with open(path, 'rb') as f:
+                record = describe(filename, f.read())
+            old = previous.get(filename, {})
+            if old.get('sha256') == record['sha256']:
+                record.update({key: old[key] for key in ('etag', 'last_modified', 'checked', 'fetched', 'local') if key in old})
+            elif old:
+                # Contents that changed since the last build were regenerated locally
+                record['local'] = True
+            manifest[filename] = record
+    save_manifest(manifest, directory)
+    return manifest
+
+
+def verify(directory=LOCAL_DIR):
+    # Status of every file in the manifest, in manifest order
+    manifest = load_manifest(directory)
+    return {filename: snapshot_status(filename, entry, directory) for filename, entry in manifest.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the local data snapshot and its manifest.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Record the checksum, size and row count of every local dataset')
+    build_parser.add_argument('--directory', default=LOCAL_DIR)
+
+    verify_parser = subparsers.add_parser('verify', help='Check every local dataset against the manifest, failing on any mismatch')
+    verify_parser.add_argument('--directory', default=LOCAL_DIR)
+
+    refresh_parser = subparsers.add_parser('refresh', help='Check every unmodified dataset against GitHub and fetch changed ones')
+    refresh_parser.add_argument('--directory', default=LOCAL_DIR)
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        print(f'Recorded {len(build_manifest(args.directory))} datasets in {manifest_path(args.directory)}')
+    elif args.command == 'verify':
+        statuses = verify(args.directory)
+        for filename, status in statuses.items():
+            print(f'{filename}: {status}')
+        if any(status != 'ok' for status in statuses.values()):
+            parser.exit(1)
+    else:
+        for filename, entry in load_manifest(args.directory).items():
+            status = snapshot_status(filename, entry, args.directory)
+            if status in ('missing', 'damaged') or (status == 'ok' and not entry.get('local')):
+                refresh(filename, entry, args.directory)
+                print(f'{filename}: checked')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import streamlit as st
+
+from charts import capital_chart_spec, difference_chart_spec
+from data_loader import CACHE_TTL, load_predictions, predictions_version
+from profiling import stage
+from stability import stability_summary
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def deep_dive_data(ticker, days, version):
+    # Shared by every section and rerun that shows the same series; `version` invalidates it when the file changes
+    data = load_predictions(ticker, days)
+
+    # Calculate the difference between 'Capital_Positive' and 'Capital_Daily_Investment'
+    data['Difference_Positive_DailyInvestment'] = data['Capital_Positive'] - data['Capital_Daily_Investment']
+    return data
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def stability_data(ticker, days, version):
+    return stability_summary(deep_dive_data(ticker, days, version))
+
+
+def render_deep_dive(deep_dive):
+    """Render one past-performance section, only doing the work while its expander is open."""
+    with st.expander(deep_dive.title, expanded=deep_dive.expanded, key=f'deep_dive_{deep_dive.ticker}_{deep_dive.days}',
+                     on_change='rerun') as expander:
+        if not expander.open:
+            return
+
+        st.subheader(deep_dive.title)
+
+        with stage(f'{deep_dive.title}: load data'):
+            version = predictions_version(deep_dive.ticker, deep_dive.days)
+            data = deep_dive_data(deep_dive.ticker, deep_dive.days, version)
+
+        with stage(f'{deep_dive.title}: charts'):
+            # Downsampled capital chart, cached per dataset
+            st.vega_lite_chart(capital_chart_spec(data), width='stretch')
+
+            # Display the downsampled chart for the difference
+            st.vega_lite_chart(difference_chart_spec(data), width='stretch')
+
+        with stage(f'{deep_dive.title}: consistency'):
+            # Rolling consistency of the positive strategy, and the worst drawdown of each capital curve
+            st.dataframe(stability_data(deep_dive.ticker, deep_dive.days, version), hide_index=True)
+
+        for comment in deep_dive.commentary:
+            st.write(comment)
@@ -0,0 +1,19 @@
+import os
+import uuid
+
+
+def atomic_write(path, write):
+    """Call write(temp_path) on a temporary file next to `path`, then move it into place, so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    temp_path = os.path.join(directory, f'.{os.path.basename(path)}.{uuid.uuid4().hex}.tmp')
+    # Created with 0666 so the process umask applies, as it would for a plain open()
+    os.close(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+    try:
+        write(temp_path)
+        if os.path.exists(path):
+            # A replaced file keeps its mode
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
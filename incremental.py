@@ -0,0 +1,273 @@
+import argparse
+import glob
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import (CAPITAL_COLUMNS, DATE_FORMAT, FLOAT_FORMAT, METRICS_COLUMNS, STARTING_CAPITAL, daily_return,
+                      read_predictions_workbook, write_metrics)
+from data_source import record_local_write
+from fileio import atomic_write
+from stability import FLAT, WINDOWS
+from storage import PREDICTIONS_NAME, parse_csv
+
+# Running totals kept per horizon; together they are enough to rebuild every Metrics column
+TOTALS = ['count', 'sum_absolute_error', 'sum_rmse', 'count_positive', 'sum_positive', 'count_negative', 'sum_negative']
+
+
+def state_path(directory, ticker):
+    return os.path.join(directory, f'{ticker}_State.json')
+
+
+# Running sums kept per rolling window, matching the statistics of stability.stability_summary
+WINDOW_TOTALS = ['hit_sum', 'sum_difference', 'sum_x_difference', 'beating', 'excess_windows', 'rising', 'slope_windows']
+
+# Ring buffers hold the last max(WINDOWS) + 1 hits and differences, enough to drop the oldest day of every window
+HISTORY = max(WINDOWS) + 1
+
+
+def empty_horizon_state():
+    state = {total: 0 for total in TOTALS}
+    state.update({column: STARTING_CAPITAL for column in CAPITAL_COLUMNS})
+    state['last_date'] = None
+
+    state['peaks'] = {column: None for column in CAPITAL_COLUMNS}
+    state['max_drawdowns'] = {column: 0.0 for column in CAPITAL_COLUMNS}
+    state['recent_hits'] = [0] * HISTORY
+    state['recent_differences'] = [0.0] * HISTORY
+    state['windows'] = {str(window): dict({total: 0 for total in WINDOW_TOTALS}, worst_hit_rate=None, latest_hit_rate=None,
+                                          latest_slope=None)
+                        for window in WINDOWS}
+    return state
+
+
+def sum_of_squares(n):
+    # 0^2 + 1^2 + ... + (n - 1)^2
+    return (n - 1) * n * (2 * n - 1) // 6
+
+
+def update_rolling(state, actual, predicted):
+    """Extend the drawdowns and rolling-window sums by the day just added, in O(len(WINDOWS))."""
+    day = state['count'] - 1
+    hit = int((predicted > 0) == (actual > 0))
+    difference = state['Capital_Positive'] - state['Capital_Daily_Investment']
+
+    for column in CAPITAL_COLUMNS:
+        peak = state[column] if state['peaks'][column] is None else max(state['peaks'][column], state[column])
+        state['peaks'][column] = peak
+        state['max_drawdowns'][column] = max(state['max_drawdowns'][column], (peak - state[column]) / peak)
+
+    for window, totals in state['windows'].items():
+        window = int(window)
+        totals['hit_sum'] += hit
+        totals['sum_difference'] += difference
+        totals['sum_x_difference'] += day * difference
+        if day >= window:
+            # Drop the day that has just left the window, and compare with the difference a full window ago
+            old = (day - window) % HISTORY
+            old_difference = state['recent_differences'][old]
+            totals['hit_sum'] -= state['recent_hits'][old]
+            totals['sum_difference'] -= old_difference
+            totals['sum_x_difference'] -= (day - window) * old_difference
+            totals['beating'] += int(difference - old_difference > FLAT)
+            totals['excess_windows'] += 1
+
+        if day + 1 >= window:
+            hit_rate = totals['hit_sum'] / window
+            totals['latest_hit_rate'] = hit_rate
+            totals['worst_hit_rate'] = hit_rate if totals['worst_hit_rate'] is None else min(totals['worst_hit_rate'], hit_rate)
+
+            # Least-squares slope against the day index, with the sums of x and x^2 in closed form
+            sum_x = window * day - window * (window - 1) // 2
+            sum_xx = sum_of_squares(day + 1) - sum_of_squares(day + 1 - window)
+            slope = (window * totals['sum_x_difference'] - sum_x * totals['sum_difference']) / (window * sum_xx - sum_x ** 2)
+            totals['latest_slope'] = slope
+            totals['rising'] += int(slope > FLAT)
+            totals['slope_windows'] += 1
+
+    state['recent_hits'][day % HISTORY] = hit
+    state['recent_differences'][day % HISTORY] = difference
+
+
+def update_horizon(state, date, actual, predicted, horizon):
+    """Extend one horizon by a single Actual/Predicted row in O(1), returning the new Predictions_DayN row."""
+    profit = (STARTING_CAPITAL / horizon) * actual / 100
+    error = actual - predicted
+
+    state['count'] += 1
+    state['sum_absolute_error'] += abs(error)
+    state['sum_rmse'] += float(np.sqrt(error ** 2))
+    if predicted > 0:
+        state['count_positive'] += 1
+        state['sum_positive'] += actual
+        state['Capital_Positive'] += profit
+    else:
+        state['count_negative'] += 1
+        state['sum_negative'] += actual
+        state['Capital_Negative'] += profit
+    state['Capital_Daily_Investment'] += profit
+    state['last_date'] = date
+    update_rolling(state, actual, predicted)
+
+    row = {'Date': date, 'Actual': actual, 'Predicted': predicted}
+    row.update({column: state[column] for column in CAPITAL_COLUMNS})
+    return row
+
+
+def state_from_predictions(predictions):
+    """Build the initial state by replaying the full history of every horizon once."""
+    state = {}
+    for horizon, frame in predictions.items():
+        horizon_state = empty_horizon_state()
+        dates = pd.to_datetime(frame['Date']).dt.strftime(DATE_FORMAT)
+        for date, actual, predicted in zip(dates, frame['Actual'].astype(float), frame['Predicted'].astype(float)):
+            update_horizon(horizon_state, date, actual, predicted, horizon)
+        state[str(horizon)] = horizon_state
+    return state
+
+
+def read_predictions_csvs(directory, ticker):
+    """Read every <TICKER>_Predictions_DayN.csv in `directory`, keyed by days, for securities without a workbook."""
+    predictions = {}
+    for path in glob.glob(os.path.join(directory, f'{ticker}_Predictions_Day*.csv')):
+        match = PREDICTIONS_NAME.match(os.path.basename(path)[:-len('.csv')])
+        if match and match['ticker'] == ticker:
+            predictions[int(match['days'])] = parse_csv(path, ['Date', 'Actual', 'Predicted'])
+    return dict(sorted(predictions.items()))
+
+
+def stability_from_state(horizon_state):
+    """The stability.stability_summary table of a series, read from its running state instead of the full history."""
+    rows = []
+    for window, totals in horizon_state['windows'].items():
+        row = {
+            'Window (days)': int(window),
+            'Latest Hit Rate': totals['latest_hit_rate'],
+            'Worst Hit Rate': totals['worst_hit_rate'],
+            'Windows Beating Daily Investment': totals['beating'] / totals['excess_windows'] if totals['excess_windows'] else np.nan,
+            'Latest Difference Slope': totals['latest_slope'],
+            'Windows with Rising Difference': totals['rising'] / totals['slope_windows'] if totals['slope_windows'] else np.nan,
+        }
+        row.update({f'Max Drawdown {column}': horizon_state['max_drawdowns'][column] for column in CAPITAL_COLUMNS})
+        rows.append(row)
+    return pd.DataFrame(rows).astype(float).astype({'Window (days)': int})
+
+
+def metrics_from_state(state, time_taken=0.0):
+    # Rebuild the Metrics frame from the running totals, without touching the history
+    horizons = np.array(sorted(int(horizon) for horizon in state))
+    totals = pd.DataFrame([state[str(horizon)] for horizon in horizons])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        average_positive = (totals['sum_positive'] / totals['count_positive']).to_numpy()
+        average_negative = (totals['sum_negative'] / totals['count_negative']).to_numpy()
+
+    metrics = pd.DataFrame({
+        'Method': [f'{horizon}_Day_Return' for horizon in horizons],
+        'Average_RMSE': totals['sum_rmse'] / totals['count'],
+        'Average_MAE': totals['sum_absolute_error'] / totals['count'],
+        'Average_Actual_Return_Positive': average_positive,
+        'Average_Actual_Return_Negative': average_negative,
+        'Average_Actual_Return_Positive_Daily': daily_return(average_positive, horizons),
+        'Average_Actual_Return_Negative_Daily': daily_return(average_negative, horizons),
+        'Capital_Positive': totals['Capital_Positive'],
+        'Capital_Negative': totals['Capital_Negative'],
+        'Capital_Daily_Investment': totals['Capital_Daily_Investment'],
+        'Time_Taken': time_taken,
+    })
+    return metrics[METRICS_COLUMNS]
+
+
+def load_state(directory, ticker):
+    with open(state_path(directory, ticker)) as f:
+        return json.load(f)
+
+
+def save_state(state, directory, ticker):
+    def write(path):
+        with open(path, 'w') as f:
+            json.dump(state, f, indent=1)
+
+    atomic_write(state_path(directory, ticker), write)
+
+
+def append_prediction_row(path, row):
+    # Appending keeps the daily refresh independent of how long the file already is
+    values = [row['Date']] + [FLOAT_FORMAT % row[column] for column in ['Actual', 'Predicted'] + CAPITAL_COLUMNS]
+    with open(path, 'a', newline='') as f:
+        f.write(','.join(values) + '\r\n')
+
+
+def apply_updates(directory, ticker, updates):
+    """Apply Date/Horizon/Actual/Predicted rows to a security's state, its DayN files and its Metrics file."""
+    start = time.perf_counter()
+    state = load_state(directory, ticker)
+    appended = set()
+
+    updates = updates.assign(Date=pd.to_datetime(updates['Date']).dt.strftime(DATE_FORMAT)).sort_values('Date', kind='stable')
+    for date, horizon, actual, predicted in updates[['Date', 'Horizon', 'Actual', 'Predicted']].itertuples(index=False):
+        horizon_state = state[str(horizon)]
+        # Rows that were already applied are skipped, so a rerun of the same update is harmless
+        if horizon_state['last_date'] is not None and date <= horizon_state['last_date']:
+            continue
+        row = update_horizon(horizon_state, date, float(actual), float(predicted), int(horizon))
+
+        predictions_path = os.path.join(directory, f'{ticker}_Predictions_Day{horizon}.csv')
+        if os.path.exists(predictions_path):
+            append_prediction_row(predictions_path, row)
+            appended.add(predictions_path)
+
+    save_state(state, directory, ticker)
+    metrics = merge_metrics(os.path.join(directory, f'{ticker}_Metrics.csv'), metrics_from_state(state, time.perf_counter() - start))
+    atomic_write(os.path.join(directory, f'{ticker}_Metrics.csv'), lambda path: write_metrics(metrics, path))
+
+    # Record the new contents in the data manifest, so the dashboard does not report them as mismatched
+    for path in sorted(appended) + [os.path.join(directory, f'{ticker}_Metrics.csv')]:
+        record_local_write(path)
+    return metrics
+
+
+def merge_metrics(path, metrics):
+    # Replace only the rows of the horizons held in the state, keeping any other rows of an existing Metrics file
+    if not os.path.exists(path):
+        return metrics
+    existing = pd.read_csv(path, float_precision='round_trip')
+    kept = existing[~existing['Method'].isin(metrics['Method'])]
+    merged = pd.concat([kept, metrics], ignore_index=True)
+    order = merged['Method'].str.split('_').str[0].astype(int)
+    return merged.iloc[order.argsort(kind='stable')].reset_index(drop=True)[METRICS_COLUMNS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally extend capital curves and metrics with new predictions.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    init_parser = subparsers.add_parser('init', help='Build the persisted state from the full prediction history')
+    init_parser.add_argument('source', help='A <TICKER>_Predictions.xlsx workbook, or a ticker whose <TICKER>_Predictions_DayN.csv files are in --directory')
+    init_parser.add_argument('--directory', default='.')
+
+    update_parser = subparsers.add_parser('update', help='Apply a CSV of new Date,Horizon,Actual,Predicted rows')
+    update_parser.add_argument('ticker')
+    update_parser.add_argument('updates')
+    update_parser.add_argument('--directory', default='.')
+
+    args = parser.parse_args()
+    if args.command == 'init':
+        if args.source.endswith('.xlsx'):
+            ticker = os.path.basename(args.source).split('_')[0]
+            predictions = read_predictions_workbook(args.source)
+        else:
+            ticker = args.source
+            predictions = read_predictions_csvs(args.directory, ticker)
+            if not predictions:
+                parser.error(f'No {ticker}_Predictions_DayN.csv files in {args.directory}')
+        save_state(state_from_predictions(predictions), args.directory, ticker)
+    else:
+        apply_updates(args.directory, args.ticker, pd.read_csv(args.updates))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from backtest import STARTING_CAPITAL
+
+# Share of current equity committed to each new trade, before dividing by the holding length as on the Home page
+POSITION_FRACTION = 1.0
+# Most equity a single (security, horizon) may have open at once
+MAX_POSITION_WEIGHT = 0.2
+# Most (security, horizon) pairs with open positions at once
+MAX_POSITIONS = 20
+
+
+def align(series):
+    """Stack {(ticker, days): Date/Actual/Predicted frame} onto one sorted date index as (dates, instruments) arrays."""
+    keys = list(series)
+    frame_dates = [series[key]['Date'].to_numpy(dtype='datetime64[ns]') for key in keys]
+    dates = np.unique(np.concatenate(frame_dates))
+    actual = np.full((len(dates), len(keys)), np.nan)
+    predicted = np.full((len(dates), len(keys)), np.nan)
+    for column, key in enumerate(keys):
+        frame = series[key]
+        rows = np.searchsorted(dates, frame_dates[column])
+        actual[rows, column] = frame['Actual'].to_numpy(dtype=float)
+        predicted[rows, column] = frame['Predicted'].to_numpy(dtype=float)
+    horizons = np.array([days for _, days in keys])
+    return keys, pd.DatetimeIndex(dates), actual, predicted, horizons
+
+
+def simulate(series, direction='Positive Prediction', position_fraction=POSITION_FRACTION,
+             max_position_weight=MAX_POSITION_WEIGHT, max_positions=MAX_POSITIONS):
+    """Run one strategy over many securities with a single pool of capital that can never go negative.
+
+    Each day, matured positions pay back their stake plus the Actual return, then new positions are opened where the
+    prediction agrees with `direction`, strongest predictions first, within the cash, per-position and open-position
+    limits. Open positions are held in a ring buffer of shape (longest holding length + 1, instruments).
+    """
+    keys, dates, actual, predicted, horizons = align(series)
+    days, instruments = actual.shape
+    slots = horizons.max() + 1
+
+    valid = ~np.isnan(actual)
+    with np.errstate(invalid='ignore'):
+        signal = valid & ((predicted > 0) if direction == 'Positive Prediction' else ~(predicted > 0))
+    strength = np.where(signal, np.abs(predicted), -np.inf)
+    growth = 1 + np.where(valid, actual, 0.0) / 100
+
+    # Stakes and payouts of open positions, indexed by the day (mod slots) they mature
+    maturing_stake = np.zeros((slots, instruments))
+    maturing_payout = np.zeros((slots, instruments))
+    open_stake = np.zeros(instruments)
+    cash = float(STARTING_CAPITAL)
+
+    equity_curve = np.empty(days)
+    cash_curve = np.empty(days)
+    open_positions = np.empty(days, dtype=int)
+    trades = np.zeros(instruments, dtype=int)
+    profit = np.zeros(instruments)
+
+    for day in range(days):
+        slot = day % slots
+        cash += maturing_payout[slot].sum()
+        profit += maturing_payout[slot] - maturing_stake[slot]
+        open_stake -= maturing_stake[slot]
+        maturing_stake[slot] = 0
+        maturing_payout[slot] = 0
+
+        equity = cash + open_stake.sum()
+        holding = open_stake > 1e-12
+        room = max_positions - holding.sum()
+
+        # Candidates are ranked by prediction strength; instruments already held may add to their position
+        candidates = np.flatnonzero(strength[day] > -np.inf)
+        candidates = candidates[np.argsort(-strength[day, candidates], kind='stable')]
+        new = ~holding[candidates]
+        candidates = candidates[~new | (np.cumsum(new) <= room)]
+
+        if len(candidates) and cash > 0:
+            stake = equity * position_fraction / horizons[candidates]
+            stake = np.minimum(stake, np.maximum(equity * max_position_weight - open_stake[candidates], 0))
+            # Scale every new stake down together when there is not enough cash for all of them
+            total = stake.sum()
+            if total > cash:
+                stake *= cash / total
+
+            due = (day + horizons[candidates]) % slots
+            maturing_stake[due, candidates] += stake
+            maturing_payout[due, candidates] += stake * growth[day, candidates]
+            open_stake[candidates] += stake
+            # Clamped, as rounding can leave a tiny negative balance after spending all the cash
+            cash = max(cash - stake.sum(), 0.0)
+            trades[candidates] += stake > 0
+
+        equity_curve[day] = cash + open_stake.sum()
+        cash_curve[day] = cash
+        open_positions[day] = (open_stake > 1e-12).sum()
+
+    curve = pd.DataFrame({'Date': dates, 'Equity': equity_curve, 'Cash': cash_curve,
+                          'Invested': equity_curve - cash_curve, 'Open Positions': open_positions})
+    contributions = pd.DataFrame({'Security': [ticker for ticker, _ in keys], 'Days Holding': horizons,
+                                  'Trades': trades, 'Realised Profit': profit})
+    return curve, contributions
@@ -0,0 +1,42 @@
+import os
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+# Timings are collected when this environment variable is set, or when the page is opened with ?profile=1
+PROFILE_ENV = 'TRADINGSTRATEGIES_PROFILE'
+
+TIMINGS_KEY = 'stage_timings'
+
+
+def profiling_enabled():
+    return bool(os.environ.get(PROFILE_ENV)) or st.query_params.get('profile') == '1'
+
+
+def start_run():
+    # Called once at the top of the script, so the panel only shows the current rerun; stages record nothing when None
+    st.session_state[TIMINGS_KEY] = [] if profiling_enabled() else None
+
+
+@contextmanager
+def stage(name):
+    """Record the wall time of a block under `name` for the current rerun, when profiling is enabled."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = st.session_state.get(TIMINGS_KEY)
+        if timings is not None:
+            timings.append((name, time.perf_counter() - start))
+
+
+def render_timing_panel():
+    # Opt-in sidebar table of per-stage durations
+    if not profiling_enabled():
+        return
+    timings = pd.DataFrame(st.session_state.get(TIMINGS_KEY, []), columns=['Stage', 'Seconds'])
+    with st.sidebar.expander('Stage timings', expanded=True):
+        st.dataframe(timings.round(4), hide_index=True)
+        st.markdown(f"<small>Total: {timings['Seconds'].sum():.4f}s</small>", unsafe_allow_html=True)
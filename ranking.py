@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+STRATEGIES = {
+    'Positive Prediction': 'Capital_Positive',
+    'Negative Prediction': 'Capital_Negative',
+    'Investing Every Day': 'Capital_Daily_Investment',
+}
+
+# Each objective scores a (security, horizon, strategy) row of the long frame; higher is better
+OBJECTIVES = {
+    'Final capital': lambda strategies: strategies['Capital'],
+    'Excess over Capital Investing Every Day': lambda strategies: strategies['Capital'] - strategies['Capital Investing Every Day'],
+    # Scales the excess by the model's forecast error; this is not a measure of return risk
+    'Excess per unit of forecast error (Average MAE)': lambda strategies: (strategies['Capital'] - strategies['Capital Investing Every Day']) / strategies['Average MAE'],
+}
+
+
+def strategy_table(metrics_by_security):
+    """One row per (security, days holding, strategy), built from raw *_Metrics.csv frames keyed by security."""
+    metrics = pd.concat(metrics_by_security, names=['Security', 'Row'])
+    horizons = metrics.groupby(level='Security').cumcount().to_numpy() + 1
+
+    # Stack the three capital columns into one long frame without looping over rows
+    capital = metrics[list(STRATEGIES.values())].to_numpy()
+    count = len(metrics)
+    return pd.DataFrame({
+        'Security': np.tile(metrics.index.get_level_values('Security').to_numpy(), len(STRATEGIES)),
+        'Days Holding': np.tile(horizons, len(STRATEGIES)),
+        'Strategy': np.repeat(list(STRATEGIES), count),
+        'Capital': capital.T.ravel(),
+        'Capital Investing Every Day': np.tile(metrics['Capital_Daily_Investment'].to_numpy(), len(STRATEGIES)),
+        'Average MAE': np.tile(metrics['Average_MAE'].to_numpy(), len(STRATEGIES)),
+    })
+
+
+def best_strategies(strategies, objective='Final capital'):
+    """The best (days holding, strategy) per security under an objective, as a leaderboard sorted best first."""
+    scored = strategies.assign(Score=OBJECTIVES[objective](strategies))
+    best = scored.loc[scored.groupby('Security', sort=False)['Score'].idxmax()]
+    return best.sort_values('Score', ascending=False).reset_index(drop=True)
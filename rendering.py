@@ -0,0 +1,39 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Cell properties and header properties shared by every metrics table
+CELL_PROPERTIES = (('width', '100px'), ('text-align', 'center'), ('font-size', '10pt'))
+HEADER_PROPERTIES = (('max-width', '80px'), ('text-align', 'center'), ('font-size', '10pt'), ('height', '40px'))
+HIGHLIGHT = 'background: lightgreen'
+
+
+def frame_digest(data):
+    # Content hash of a frame, including its column labels
+    hashed = pd.util.hash_pandas_object(data, index=True).values
+    return hashlib.sha256(hashed.tobytes() + '|'.join(map(str, data.columns)).encode()).hexdigest()
+
+
+def highlight_row(data, highlight_index, highlight=HIGHLIGHT):
+    # Build the whole style grid in one pass instead of calling a lambda per row
+    rows = np.zeros(len(data), dtype=bool)
+    if highlight_index is not None:
+        rows[highlight_index] = True
+    styles = np.where(rows[:, None], highlight, '')
+    return pd.DataFrame(np.broadcast_to(styles, data.shape), index=data.index, columns=data.columns)
+
+
+@st.cache_data(show_spinner=False, max_entries=1000)
+def _render(digest, highlight_days, cell_properties, header_properties, _data):
+    highlight_index = None if highlight_days is None else highlight_days - 1
+    styled = _data.style.apply(highlight_row, axis=None, highlight_index=highlight_index)\
+                  .set_properties(**dict(cell_properties))\
+                  .set_table_styles([dict(selector='th', props=list(header_properties))])
+    return styled.to_html()
+
+
+def render_metrics_table(data, highlight_days=None, cell_properties=CELL_PROPERTIES, header_properties=HEADER_PROPERTIES):
+    """Render a preprocessed metrics frame to HTML, cached on its content and style."""
+    return _render(frame_digest(data), highlight_days, cell_properties, header_properties, data)
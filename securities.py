@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Security:
+    ticker: str
+    name: str
+    metrics_file: str
+    commentary: tuple = ()
+    last_updated: str = ''
+
+    @property
+    def label(self):
+        return f'{self.ticker} ({self.name})'
+
+
+# Every tracked security, in the order they appear on the Home page
+SECURITIES = [
+    Security(
+        ticker='VUSA',
+        name='S&P 500',
+        metrics_file='VUSA_Metrics.csv',
+        commentary=(
+            'The algorithm performs very poorly. In no cases does the positive prediction strategy beat the investing every day strategy.',
+            'Interestingly, the predictive accuracy is actually so bad, that for horizons of 1, 2 and 3 days, investing when the model advises you to not invest, is better than the market rate. It is worth investigating this further, particularly for the 1 day horizon.',
+        ),
+        last_updated='02/10/23',
+    ),
+    Security(
+        ticker='VUKE',
+        name='FTSE 100',
+        metrics_file='VUKE_Metrics.csv',
+        commentary=(
+            'The algorithm performs poorly, with only 1 of the positive prediction investment strategies beating the respective market rate for that time horizon. This is holding for 3 days, but even so, the capital for investing every day is greater.',
+            'In fact, the only times when the market rate is beaten is when we invest despite predicting negative returns, for horizons 7-10. This shows the algorithm as a poor predictor, but in fact investing when predictions are negative could be a viable strategy here. Further investigation is needed.',
+        ),
+        last_updated='02/10/23',
+    ),
+    Security(
+        ticker='INRG',
+        name='iShares Global Clean Energy',
+        metrics_file='INRG_Metrics.csv',
+        commentary=(
+            'The algorithm performs well. Investing when positive beats out investing every day in each of the horizons.',
+            'The best investment strategy appears to be holding for 5 days, after the algorithm predicts positive predictions.',
+        ),
+        last_updated='02/10/23',
+    ),
+    Security(
+        ticker='VUKG',
+        name='FTSE 100 Growth',
+        metrics_file='VUKG_Metrics.csv',
+        commentary=(
+            'The algorithm performs poorly, with investing when positive being consistently beaten my the market rate.',
+            'The strongest returns actually come when investing when the prediction of the algorithm is negative, over a 9 day horizon. Further investigation is needed.',
+        ),
+        last_updated='02/10/23',
+    ),
+    Security(
+        ticker='ARKK',
+        name='ARK Innovation',
+        metrics_file='ARKK_Metrics.csv',
+        commentary=(
+            'The algorithm performs poorly, with investing when positive being consistently beaten my the market rate.',
+            'The strongest returns actually come when investing when the prediction of the algorithm is negative, over a 1 day horizon. Further investigation is needed.',
+        ),
+        last_updated='11/10/23',
+    ),
+    Security(
+        ticker='GLD',
+        name='Gold',
+        metrics_file='GLD_Metrics.csv',
+        commentary=(
+            'The algorithm performs adequately over certain time horizons, beating the market rate on a few occasions.',
+            'The strongest returns come when investing when the prediction of the algorithm is positive, over a 3 day horizon.',
+        ),
+        last_updated='11/10/23',
+    ),
+    Security(
+        ticker='VNQ',
+        name='US Real Estate',
+        metrics_file='VNQ_Metrics.csv',
+        commentary=(
+            'The algorithm performs excellently, with investing when positive consistently beating the market rate, and usually by a significant margin.',
+            'The strongest returns come when investing when the prediction of the algorithm is positive, over a 4 day horizon.',
+        ),
+        last_updated='11/10/23',
+    ),
+    Security(
+        ticker='EEM',
+        name='Emerging Markets',
+        metrics_file='EEM_Metrics.csv',
+        commentary=(
+            'The algorithm performs adequately, with investing when positive beating the market rate on occasion.',
+            'Despite this, returns are almost always negative for any of the strategies, so it seems best to ignore this ETF.',
+        ),
+        last_updated='11/10/23',
+    ),
+    Security(
+        ticker='XLK',
+        name='Technology Fund',
+        metrics_file='XLK_Metrics.csv',
+        commentary=(
+            'The algorithm performs poorly, with investing when positive being consistently beaten by the market rate.',
+            'Returns are generally high, but the algorithms almost never outperform investing every day. Since we want to focus on using the algorithm, it seems best to ignore this ETF.',
+        ),
+        last_updated='11/10/23',
+    ),
+]
+
+SECURITIES_BY_LABEL = {security.label: security for security in SECURITIES}
+
+
+@dataclass(frozen=True)
+class DeepDive:
+    ticker: str
+    days: int
+    commentary: tuple = ()
+    expanded: bool = False
+
+    @property
+    def title(self):
+        return f'{self.ticker} {self.days}-Day Hold'
+
+
+# Sections of the "Can Past Performance Guide Future Prediction?" page, in display order
+DEEP_DIVES = [
+    DeepDive(
+        ticker='INRG',
+        days=5,
+        commentary=(
+            '''We would ideally see a gradually increasingly slope in the graph showing the difference, but we can see that it is instead volatile. The positive investment strategy makes gains in April 2022 as it abstains from investing during a downturn, and the same happens in October 2022. However, between these periods the positive strategy fails to make gains as significant as investing every day. From October 2022 on, both strategies are similar.''',
+            '''There is not a clear indication that the algorithm consistently overperforms the market rate.''',
+        ),
+        expanded=True,
+    ),
+    DeepDive(
+        ticker='GLD',
+        days=3,
+        commentary=(
+            '''In general, the difference between the positive strategy and constant strategy is increasing. There is a major decline in the difference between September 2022 and November 2022, where a significant increase in the price of GLD is not anticipated by the algorithm.''',
+            '''Nevertheless, the result is promising, and shows how usually, our algorithm ourperforms the market consistently.''',
+        ),
+        expanded=True,
+    ),
+    DeepDive(
+        ticker='VNQ',
+        days=4,
+        commentary=(
+            '''Our result here is strong, as the difference between our positive investment strategy and our constant investment strategy grows over time. It seems the main characteristic is the two are similar over period of time, before the alrogithm correctly predicts significant drops, which are avoided by the positive investment strategy.''',
+            '''This is a promising result for our algorithm, as it performs well consistently in this case.''',
+        ),
+        expanded=True,
+    ),
+]
@@ -0,0 +1,102 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest import STARTING_CAPITAL, read_predictions_workbook
+
+RESAMPLES = 10000
+CONFIDENCE = 0.95
+
+# Resamples are generated in chunks of this many rows to bound memory for long histories
+CHUNK_SIZE = 1000
+
+
+def excess_capital(signal, actual, horizon):
+    """Final capital of a strategy minus Capital_Daily_Investment, for a 0/1 signal or a 2-D batch of them."""
+    stake = STARTING_CAPITAL / horizon
+    return stake * ((signal - 1) * actual).sum(axis=-1) / 100
+
+
+def permutation_null(signal, actual, horizon, resamples, rng):
+    # Shuffle the signal across dates, keeping how often the strategy invests
+    null = np.empty(resamples)
+    for start in range(0, resamples, CHUNK_SIZE):
+        rows = min(CHUNK_SIZE, resamples - start)
+        shuffled = rng.permuted(np.broadcast_to(signal, (rows, len(signal))), axis=1)
+        null[start:start + rows] = excess_capital(shuffled, actual, horizon)
+    return null
+
+
+def block_bootstrap(signal, actual, horizon, resamples, rng):
+    # Resample whole blocks of days, as overlapping N day returns are correlated over about N days
+    length = len(signal)
+    block = max(horizon, 1)
+    blocks = -(-length // block)
+    offsets = np.arange(block)
+    statistics = np.empty(resamples)
+    for start in range(0, resamples, CHUNK_SIZE):
+        rows = min(CHUNK_SIZE, resamples - start)
+        starts = rng.integers(0, length - block + 1, size=(rows, blocks))
+        index = (starts[:, :, None] + offsets).reshape(rows, -1)[:, :length]
+        statistics[start:start + rows] = excess_capital(signal[index], actual[index], horizon)
+    return statistics
+
+
+def test_horizon(task):
+    """p-values and confidence intervals for the positive and negative strategies of one series."""
+    ticker, horizon, actual, predicted, resamples, seed = task
+    rng = np.random.default_rng(seed)
+    rows = []
+    for strategy, signal in [('Positive Prediction', predicted > 0), ('Negative Prediction', ~(predicted > 0))]:
+        signal = signal.astype(float)
+        observed = excess_capital(signal, actual, horizon)
+        null = permutation_null(signal, actual, horizon, resamples, rng)
+        bootstrap = block_bootstrap(signal, actual, horizon, resamples, rng)
+        low, high = np.quantile(bootstrap, [(1 - CONFIDENCE) / 2, (1 + CONFIDENCE) / 2])
+        rows.append({
+            'Security': ticker,
+            'Days Holding': horizon,
+            'Strategy': strategy,
+            'Excess over Capital Investing Every Day': observed,
+            # One-sided: how often a random signal with the same number of trades does at least as well
+            'p-value': (1 + np.sum(null >= observed)) / (resamples + 1),
+            'CI Low': low,
+            'CI High': high,
+        })
+    return rows
+
+
+def run_tests(predictions_by_security, resamples=RESAMPLES, workers=None, seed=0):
+    """Test every (security, horizon) pair across a process pool, with independent reproducible random streams."""
+    tasks = [(ticker, horizon, frame['Actual'].to_numpy(dtype=float), frame['Predicted'].to_numpy(dtype=float))
+             for ticker, predictions in predictions_by_security.items() for horizon, frame in sorted(predictions.items())]
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    tasks = [task + (resamples, task_seed) for task, task_seed in zip(tasks, seeds)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(test_horizon, tasks))
+    return pd.DataFrame([row for rows in results for row in rows])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test whether strategies beat investing every day more often than chance.')
+    parser.add_argument('workbooks', nargs='+', help='Paths to <TICKER>_Predictions.xlsx workbooks')
+    parser.add_argument('--resamples', type=int, default=RESAMPLES)
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (defaults to the CPU count)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the results to this CSV instead of printing them')
+    args = parser.parse_args()
+
+    predictions = {os.path.basename(workbook).split('_')[0]: read_predictions_workbook(workbook) for workbook in args.workbooks}
+    results = run_tests(predictions, args.resamples, args.workers, args.seed)
+    if args.output:
+        results.to_csv(args.output, index=False)
+    else:
+        print(results.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
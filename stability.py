@@ -0,0 +1,87 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Rolling window lengths in trading days
+WINDOWS = (20, 60, 120, 250)
+
+# Changes and slopes this close to zero are rounding noise on a flat difference (the DayN CSVs keep 10 significant
+# digits), and count as neither beating nor rising
+FLAT = 1e-6
+
+CAPITAL_COLUMNS = ['Capital_Positive', 'Capital_Negative', 'Capital_Daily_Investment']
+
+
+def window_sums(values, windows):
+    """Sum of `values` over each trailing window, shape (len(windows), len(values)), NaN until a window is full."""
+    windows = np.asarray(windows)
+    cumulative = np.concatenate([[0.0], np.cumsum(values)])
+    ends = np.arange(1, len(values) + 1)
+    starts = ends[None, :] - windows[:, None]
+    full = starts >= 0
+    sums = cumulative[ends][None, :] - cumulative[np.where(full, starts, 0)]
+    return np.where(full, sums, np.nan)
+
+
+def rolling_hit_rate(actual, predicted, windows=WINDOWS):
+    # A hit is a positive prediction followed by a positive return, or a non-positive one followed by a non-positive return
+    hits = ((predicted > 0) == (actual > 0)).astype(float)
+    return window_sums(hits, windows) / np.asarray(windows)[:, None]
+
+
+def rolling_excess(difference, windows=WINDOWS):
+    # Change in the positive strategy's lead over investing every day across each window
+    windows = np.asarray(windows)
+    lagged = np.arange(len(difference))[None, :] - windows[:, None]
+    return np.where(lagged >= 0, difference[None, :] - difference[np.maximum(lagged, 0)], np.nan)
+
+
+def rolling_slope(values, windows=WINDOWS):
+    """Least-squares slope of `values` against the day index over each trailing window, from running sums."""
+    x = np.arange(len(values), dtype=float)
+    sum_x = window_sums(x, windows)
+    sum_y = window_sums(values, windows)
+    sum_xy = window_sums(x * values, windows)
+    sum_xx = window_sums(x * x, windows)
+    windows = np.asarray(windows, dtype=float)[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (windows * sum_xy - sum_x * sum_y) / (windows * sum_xx - sum_x ** 2)
+
+
+def max_drawdown(capital):
+    # Largest fall from a running peak, as a fraction of that peak
+    peaks = np.maximum.accumulate(capital)
+    return float(np.max((peaks - capital) / peaks))
+
+
+def stability_summary(data, windows=WINDOWS):
+    """Consistency statistics of one *_Predictions_DayN series, one row per window length."""
+    actual = data['Actual'].to_numpy(dtype=float)
+    predicted = data['Predicted'].to_numpy(dtype=float)
+    difference = (data['Capital_Positive'] - data['Capital_Daily_Investment']).to_numpy(dtype=float)
+
+    hit_rate = rolling_hit_rate(actual, predicted, windows)
+    excess = rolling_excess(difference, windows)
+    slope = rolling_slope(difference, windows)
+
+    # Windows longer than the series leave all-NaN rows, which are reported as NaN
+    with warnings.catch_warnings(), np.errstate(invalid='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+        summary = pd.DataFrame({
+            'Window (days)': windows,
+            'Latest Hit Rate': hit_rate[:, -1],
+            'Worst Hit Rate': np.nanmin(hit_rate, axis=1),
+            'Windows Beating Daily Investment': np.nansum(excess > FLAT, axis=1) / np.sum(~np.isnan(excess), axis=1),
+            'Latest Difference Slope': slope[:, -1],
+            'Windows with Rising Difference': np.nansum(slope > FLAT, axis=1) / np.sum(~np.isnan(slope), axis=1),
+        })
+    for column in CAPITAL_COLUMNS:
+        summary[f'Max Drawdown {column}'] = max_drawdown(data[column].to_numpy(dtype=float))
+    return summary
+
+
+def screen(series, windows=WINDOWS):
+    """Stack the summaries of many series, keyed by e.g. (ticker, days), to screen for consistent outperformance."""
+    summaries = pd.concat({key: stability_summary(data, windows) for key, data in series.items()})
+    return summaries.droplevel(-1)
@@ -0,0 +1,136 @@
+import argparse
+import glob
+import os
+import re
+
+import pandas as pd
+
+from backtest import HORIZONS, sheet_name, write_metrics, write_predictions
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+LOCAL_DIR = os.environ.get('TRADINGSTRATEGIES_DATA_DIR', os.path.dirname(os.path.abspath(__file__)))
+
+COMPRESSION = 'zstd'
+
+# <TICKER>_Predictions_Day<N>, the name of a single horizon's prediction series
+PREDICTIONS_NAME = re.compile(r'^(?P<ticker>[A-Z]+)_Predictions_Day(?P<days>\d+)$')
+
+
+def parquet_available():
+    return pq is not None
+
+
+def parse_csv(source, columns=None):
+    """Parse a Metrics or Predictions CSV, handling the UTF-8 BOM and typing the Date column."""
+    data = pd.read_csv(source, encoding='utf-8-sig', usecols=columns, float_precision='round_trip')
+    if 'Date' in data.columns:
+        data['Date'] = pd.to_datetime(data['Date'])
+    return data
+
+
+def write_parquet(data, path):
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    pq.write_table(table, path, compression=COMPRESSION)
+
+
+def read_parquet(path, columns=None):
+    # Memory-mapped, and only the requested columns are decoded
+    return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+def source_path(name, directory=LOCAL_DIR):
+    """The file a dataset will be read from: its Parquet copy when that is at least as new as the CSV or XLSX source."""
+    sources = [os.path.join(directory, f'{name}.csv')]
+    match = PREDICTIONS_NAME.match(name)
+    if match:
+        sources.append(os.path.join(directory, f'{match["ticker"]}_Predictions.xlsx'))
+    source = next((path for path in sources if os.path.exists(path)), None)
+
+    # The writers only update the CSV and XLSX files, so an older Parquet copy is out of date and skipped
+    parquet_path = os.path.join(directory, f'{name}.parquet')
+    if parquet_available() and os.path.exists(parquet_path):
+        if source is None or os.path.getmtime(parquet_path) >= os.path.getmtime(source):
+            return parquet_path
+    return source
+
+
+def read_frame(name, columns=None, directory=LOCAL_DIR):
+    """Read a dataset such as 'GLD_Metrics' or 'GLD_Predictions_Day3' from the fastest local format available."""
+    path = source_path(name, directory)
+    if path is None:
+        raise FileNotFoundError(f'No local copy of {name} in {directory}')
+    if path.endswith('.parquet'):
+        return read_parquet(path, columns)
+    if path.endswith('.csv'):
+        return parse_csv(path, columns)
+
+    days = int(PREDICTIONS_NAME.match(name)['days'])
+    data = pd.read_excel(path, sheet_name=sheet_name(days), usecols=columns)
+    if 'Date' in data.columns:
+        data['Date'] = pd.to_datetime(data['Date'])
+    return data
+
+
+def convert_directory(directory=LOCAL_DIR):
+    """Write a Parquet file next to every Predictions CSV, and one per workbook horizon sheet without its own CSV.
+
+    Metrics files stay as CSV only, as the dashboard reads them as bytes checked against the data manifest.
+    """
+    converted = []
+    for path in sorted(glob.glob(os.path.join(directory, '*_Predictions_Day*.csv'))):
+        write_parquet(parse_csv(path), path[:-len('.csv')] + '.parquet')
+        converted.append(path)
+
+    for path in sorted(glob.glob(os.path.join(directory, '*_Predictions.xlsx'))):
+        ticker = os.path.basename(path).split('_')[0]
+        sheets = pd.read_excel(path, sheet_name=None)
+        for horizon in HORIZONS:
+            # A DayN CSV takes precedence over the workbook sheet, as it is the file the writers keep up to date
+            if sheet_name(horizon) not in sheets or os.path.exists(os.path.join(directory, f'{ticker}_Predictions_Day{horizon}.csv')):
+                continue
+            data = sheets[sheet_name(horizon)]
+            data['Date'] = pd.to_datetime(data['Date'])
+            write_parquet(data, os.path.join(directory, f'{ticker}_Predictions_Day{horizon}.parquet'))
+        converted.append(path)
+    return converted
+
+
+def export_csv(name, path, directory=LOCAL_DIR):
+    # Write a dataset back out in the original CSV layout, for tools that still expect text files
+    data = read_frame(name, directory=directory)
+    if PREDICTIONS_NAME.match(name):
+        write_predictions(data, path)
+    else:
+        write_metrics(data, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert the datasets to Parquet, or export them back to CSV.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subparsers.add_parser('convert', help='Write Parquet copies of every Predictions CSV and XLSX workbook')
+    convert_parser.add_argument('--directory', default=LOCAL_DIR)
+
+    export_parser = subparsers.add_parser('export', help='Export a dataset to CSV')
+    export_parser.add_argument('name', help="Dataset name, e.g. 'GLD_Predictions_Day3'")
+    export_parser.add_argument('path')
+    export_parser.add_argument('--directory', default=LOCAL_DIR)
+
+    args = parser.parse_args()
+    if args.command == 'convert':
+        if not parquet_available():
+            parser.error('pyarrow is required to write Parquet files')
+        for path in convert_directory(args.directory):
+            print(f'Converted {os.path.basename(path)}')
+    else:
+        export_csv(args.name, args.path, args.directory)
+
+
+if __name__ == '__main__':
+    main()
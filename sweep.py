@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from backtest import STARTING_CAPITAL, stack_horizons
+
+# Minimum size of |Predicted| needed to enter, in percent
+THRESHOLDS = np.round(np.arange(0, 5.01, 0.25), 2)
+
+DIRECTIONS = ['Positive Prediction', 'Negative Prediction']
+SIZING_RULES = ['Fixed', 'Capital Proportional', 'Prediction Scaled']
+
+# Prediction-scaled stakes are capped at this multiple of the fixed stake
+MAX_SCALE = 3
+
+
+def entry_signals(predicted, valid, thresholds):
+    """Entry masks of shape (directions, thresholds, days, horizons); a zero threshold reproduces the original strategies."""
+    thresholds = np.asarray(thresholds, dtype=float)[:, None, None]
+    with np.errstate(invalid='ignore'):
+        positive = predicted[None] > thresholds
+        negative = predicted[None] <= -thresholds
+    return np.stack([positive, negative]) & valid[None, None]
+
+
+def final_capital(signals, returns, horizons, scale):
+    """Final capital of every configuration for each sizing rule, shape (sizing rules, ...signals shape without days)."""
+    fraction = 1 / np.asarray(horizons, dtype=float)
+    invested = signals * returns
+
+    # Fixed: 100/N per trade, as on the Home page
+    fixed = STARTING_CAPITAL + STARTING_CAPITAL * (invested * fraction).sum(axis=-2)
+    # Capital proportional: 1/N of current capital per trade, so capital compounds
+    proportional = STARTING_CAPITAL * np.prod(1 + invested * fraction, axis=-2)
+    # Prediction scaled: the fixed stake multiplied by |Predicted| relative to the median of earlier predictions, capped at MAX_SCALE
+    scaled = STARTING_CAPITAL + STARTING_CAPITAL * (invested * fraction * scale).sum(axis=-2)
+    return np.stack([fixed, proportional, scaled])
+
+
+def sweep(predictions, thresholds=THRESHOLDS):
+    """Evaluate every direction x threshold x sizing rule x horizon in one broadcast, returning a tidy results cube."""
+    horizons, actual, predicted = stack_horizons(predictions)
+    valid = ~np.isnan(actual)
+    returns = np.where(valid, actual, 0.0) / 100
+    magnitude = np.abs(predicted)
+    # Only predictions made before each day set its reference size, so early stakes do not use later predictions;
+    # the first day, with no history, gets the fixed stake
+    past_median = pd.DataFrame(magnitude).expanding().median().shift(1).to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        relative = np.where(np.isnan(past_median), 1.0, magnitude / past_median)
+    scale = np.where(valid, np.minimum(relative, MAX_SCALE), 0.0)
+
+    signals = entry_signals(predicted, valid, thresholds)
+    capital = final_capital(signals, returns, horizons, scale)
+    every_day = final_capital(valid[None, None], returns, horizons, scale)[:, 0, 0]
+    trades = signals.sum(axis=-2)
+
+    # Label every axis and flatten: (sizing, direction, threshold, horizon)
+    index = pd.MultiIndex.from_product([SIZING_RULES, DIRECTIONS, np.asarray(thresholds), horizons],
+                                       names=['Sizing', 'Direction', 'Threshold', 'Days Holding'])
+    shape = capital.shape
+    cube = pd.DataFrame({
+        'Capital': capital.ravel(),
+        'Capital Investing Every Day': np.broadcast_to(every_day[:, None, None, :], shape).ravel(),
+        'Trades': np.broadcast_to(trades[None], shape).ravel(),
+    }, index=index)
+    cube['Excess over Investing Every Day'] = cube['Capital'] - cube['Capital Investing Every Day']
+    return cube.sort_index()